@@ -12,10 +12,90 @@ While the full Cypher SQL functions are still being integrated, this shows:
 3. A roadmap for full Cypher integration
 """
 
+import array
+import ctypes
 import sqlite3
 import json
 import os
-from typing import List, Dict, Any, Optional
+import re
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from functools import lru_cache
+from types import MappingProxyType
+from typing import List, Dict, Any, Callable, Optional, Tuple
+
+from graph_batch import NODE_BATCH_SQL, EDGE_BATCH_SQL
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _dumps(value: Any) -> str:
+    """Serialize to JSON text, using orjson's C encoder when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(value).decode()
+    return json.dumps(value)
+
+
+@lru_cache(maxsize=256)
+def _cached_dumps(value: Any) -> str:
+    """Serialize a hashable value that repeats across rows (label sets, types)"""
+    return _dumps(value)
+
+
+def _loads(text: str) -> Any:
+    """Parse JSON text, using orjson's C decoder when it is installed"""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+@lru_cache(maxsize=256)
+def _property_predicate(keys: Tuple[Any, ...]) -> Callable[[Dict[str, Any], Tuple], bool]:
+    """
+    Generate a predicate comparing a node's properties against one value per key.
+    
+    The comparison is unrolled into a single expression, avoiding a generator
+    frame per node; only the key shape is cached, values are passed in.
+    """
+    conds = " and ".join(f"p.get({key!r}) == v[{i}]" for i, key in enumerate(keys))
+    namespace = {}
+    exec(f"def _p(p, v):\n    return {conds or 'True'}\n", namespace)
+    return namespace['_p']
+
+
+# Shared, immutable stand-ins for omitted labels/properties
+_EMPTY_TUPLE = ()
+_EMPTY_DICT = MappingProxyType({})
+
+# Relationship types travel in the edge properties; weights use the graph default
+_DEFAULT_WEIGHT = 1.0
+
+# Cypher patterns understood by CypherGraphDB.cypher_query
+_CREATE_NODE_RE = re.compile(
+    r"CREATE\s*\(\s*\w*:(?P<label>\w+)\s*\{(?P<props>[^}]*)\}\s*\)", re.I)
+_MATCH_RETURN_RE = re.compile(
+    r"MATCH\s*\(\s*\w*(?::(?P<label>\w+))?\s*\).*\bRETURN\b", re.I | re.S)
+_CREATE_RELATIONSHIP_RE = re.compile(
+    r"CREATE\s*\([^)]*\)-\[[^\]]*\]->\([^)]*\)", re.I)
+# Whitespace runs outside of quoted strings, for normalizing query text
+_WHITESPACE_RE = re.compile(r"('[^']*'|\"[^\"]*\")|\s+")
+_PROP_RE = re.compile(
+    r"(\w+)\s*:\s*(?:'([^']*)'|\"([^\"]*)\"|(-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?)|(\w+))")
+_JSON_LITERALS = {'true': 'true', 'false': 'false', 'null': 'null'}
+
+
+class _Edge:
+    """Relationship metadata record; __slots__ avoids a per-instance __dict__"""
+    __slots__ = ('type', 'properties', 'from_id', 'to_id')
+    
+    def __init__(self, rel_type: str, properties: Dict[str, Any], from_id: int, to_id: int):
+        self.type = rel_type
+        self.properties = properties
+        self.from_id = from_id
+        self.to_id = to_id
 
 
 class CypherGraphDB:
@@ -27,9 +107,18 @@ class CypherGraphDB:
     Cypher integration is completed.
     """
     
-    def __init__(self, db_path: str = ":memory:"):
-        self.conn = sqlite3.connect(db_path)
-        self.conn.row_factory = sqlite3.Row
+    def __init__(self, db_path: str = ":memory:", verbose: bool = False):
+        self._verbose = verbose
+        self._stats = Counter()
+        # Autocommit mode: transactions are opened explicitly by flush()/bulk_load()
+        self.conn = sqlite3.connect(db_path, isolation_level=None)
+        
+        # WAL with synchronous=NORMAL keeps commits durable across application
+        # crashes while avoiding an fsync per transaction
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA temp_store=MEMORY")
+        self.conn.execute("PRAGMA cache_size=-65536")
         
         # Load the graph extension
         extension_path = "../build/libgraph.so"
@@ -40,6 +129,20 @@ class CypherGraphDB:
         else:
             raise Exception(f"❌ Graph extension not found: {extension_path}")
             
+        # Single-row writes call the extension's C entry points directly when
+        # this build exports them, skipping SQL parsing and VDBE dispatch
+        lib = ctypes.CDLL(extension_path)
+        self._node_add_direct = getattr(lib, 'graph_node_add_direct', None)
+        self._edge_add_direct = getattr(lib, 'graph_edge_add_direct', None)
+        if self._node_add_direct is not None:
+            self._node_add_direct.argtypes = [ctypes.c_int64, ctypes.c_char_p]
+            self._node_add_direct.restype = ctypes.c_int64
+        if self._edge_add_direct is not None:
+            self._edge_add_direct.argtypes = [ctypes.c_int64, ctypes.c_int64,
+                                              ctypes.c_double, ctypes.c_char_p]
+            self._edge_add_direct.restype = ctypes.c_int64
+            
+        # Rows come back as plain tuples; reads index result columns by position
         self.cursor = self.conn.cursor()
         
         # Create virtual graph table
@@ -49,12 +152,37 @@ class CypherGraphDB:
         except sqlite3.Error as e:
             print(f"ℹ️  Virtual table: {e}")
             
-        # Store node and relationship metadata for Cypher-like operations
-        self.nodes = {}  # node_id -> {labels, properties}
-        self.relationships = {}  # edge_id -> {type, properties, from_id, to_id}
-        self.next_node_id = 1
+        # Store node and relationship metadata for Cypher-like operations.
+        # The extension keeps only an id and a JSON blob per row, with nothing
+        # to look up labels, property values or relationship types by, so the
+        # mirror (and the indexes below) is what keeps MATCH lookups cheap.
+        # Node ids are dense from 1, so node metadata lives in parallel lists
+        # indexed by node_id - 1 rather than in a dict keyed by id.
+        self._node_labels: List[List[str]] = []
+        self._node_props: List[Dict[str, Any]] = []
+        self.relationships = {}  # edge_id -> _Edge
         self.next_edge_id = 1
         
+        # Secondary indexes over the node lists for match_nodes
+        self._by_label = defaultdict(set)  # label -> {node_id}
+        self._by_prop = defaultdict(set)   # (key, value) -> {node_id}
+        
+        # Adjacency indexes over self.relationships for get_relationships
+        self._out = defaultdict(set)       # from_id -> {edge_id}
+        self._in = defaultdict(set)        # to_id -> {edge_id}
+        self._by_type = defaultdict(set)   # type -> {edge_id}
+        
+        # Algorithm results memoized until the next write
+        self._version = 0
+        self._shortest_path_cached = lru_cache(maxsize=4096)(self._query_shortest_path)
+        self._centrality_cached = lru_cache(maxsize=4096)(self._query_degree_centrality)
+        self._deg_cache: Optional[array.array] = None  # node_id -> degree centrality
+        self._deg_version = -1
+        
+        # Rows queued for the next batched insert
+        self._pending_nodes = []  # (node_id, node_data JSON)
+        self._pending_edges = []  # (from_id, to_id, edge_data JSON)
+        
     def __enter__(self):
         return self
         
@@ -68,151 +196,294 @@ class CypherGraphDB:
     # Core Graph Operations (Working)
     def create_node(self, labels: List[str] = None, properties: Dict[str, Any] = None) -> int:
         """Create a node with labels and properties (Cypher: CREATE (n:Label {props}))"""
-        node_id = self.next_node_id
-        self.next_node_id += 1
+        node_id = self._queue_node(labels, properties)
+        self.flush()
         
-        # Store metadata
-        self.nodes[node_id] = {
-            'labels': labels or [],
-            'properties': properties or {}
-        }
-        
-        # Create in graph database
-        node_data = {
-            'labels': labels or [],
-            'properties': properties or {}
-        }
-        
-        self.cursor.execute("SELECT graph_node_add(?, ?) as result", 
-                           (node_id, json.dumps(node_data)))
-        result = self.cursor.fetchone()
-        
-        print(f"📍 Created node {node_id} with labels {labels} and {len(properties or {})} properties")
+        if __debug__ and self._verbose:
+            print(f"📍 Created node {node_id} with labels {labels} and {len(properties) if properties else 0} properties")
         return node_id
         
+    def create_nodes_bulk(self, nodes: List[Tuple[List[str], Dict[str, Any]]]) -> List[int]:
+        """Create many nodes in one round trip (Cypher: UNWIND $rows AS row CREATE (n))"""
+        node_ids = [self._queue_node(labels, properties) for labels, properties in nodes]
+        self.flush()
+        
+        if __debug__ and self._verbose:
+            print(f"📍 Created {len(node_ids)} nodes")
+        return node_ids
+        
     def create_relationship(self, from_node: int, to_node: int, rel_type: str, 
                           properties: Dict[str, Any] = None) -> int:
         """Create a relationship (Cypher: CREATE (a)-[r:TYPE {props}]->(b))"""
+        edge_id = self._queue_relationship(from_node, to_node, rel_type, properties)
+        self.flush()
+        
+        if __debug__ and self._verbose:
+            print(f"🔗 Created relationship {edge_id}: ({from_node})-[:{rel_type}]->({to_node})")
+        return edge_id
+        
+    def create_relationships_bulk(self, relationships: List[Tuple[int, int, str, Dict[str, Any]]]) -> List[int]:
+        """Create many relationships in one round trip"""
+        edge_ids = [self._queue_relationship(from_node, to_node, rel_type, properties)
+                    for from_node, to_node, rel_type, properties in relationships]
+        self.flush()
+        
+        if __debug__ and self._verbose:
+            print(f"🔗 Created {len(edge_ids)} relationships")
+        return edge_ids
+        
+    def flush(self):
+        """Send all queued nodes and relationships to the graph in one transaction"""
+        if not self._pending_nodes and not self._pending_edges:
+            return
+            
+        with self._transaction():
+            if len(self._pending_nodes) == 1 and self._node_add_direct is not None:
+                node_id, node_json = self._pending_nodes[0]
+                if self._node_add_direct(node_id, node_json.encode()) < 0:
+                    raise sqlite3.OperationalError(f"graph_node_add_direct failed for node {node_id}")
+            elif self._pending_nodes:
+                rows = ",".join(f"[{node_id},{node_json}]" for node_id, node_json in self._pending_nodes)
+                self.cursor.execute(NODE_BATCH_SQL, (f"[{rows}]",))
+            self._pending_nodes.clear()
+            
+            if len(self._pending_edges) == 1 and self._edge_add_direct is not None:
+                from_id, to_id, edge_json = self._pending_edges[0]
+                if self._edge_add_direct(from_id, to_id, _DEFAULT_WEIGHT, edge_json.encode()) < 0:
+                    raise sqlite3.OperationalError(f"graph_edge_add_direct failed for ({from_id})->({to_id})")
+            elif self._pending_edges:
+                rows = ",".join(f"[{from_id},{to_id},{_DEFAULT_WEIGHT},{edge_json}]"
+                                for from_id, to_id, edge_json in self._pending_edges)
+                self.cursor.execute(EDGE_BATCH_SQL, (f"[{rows}]",))
+            self._pending_edges.clear()
+                
+        # The graph changed, so previously computed results are stale
+        self._version += 1
+        self._shortest_path_cached.cache_clear()
+        self._centrality_cached.cache_clear()
+                
+    @contextmanager
+    def bulk_load(self):
+        """Run every write in the block inside a single BEGIN IMMEDIATE ... COMMIT"""
+        with self._transaction("IMMEDIATE"):
+            yield self
+            self.flush()
+            
+    @contextmanager
+    def _transaction(self, mode: str = ""):
+        """Open a transaction unless one is already active (e.g. inside bulk_load)"""
+        if self.conn.in_transaction:
+            yield
+            return
+            
+        self.conn.execute(f"BEGIN {mode}")
+        try:
+            yield
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        self.conn.execute("COMMIT")
+        
+    def flush_stats(self):
+        """Print a one-line summary of the writes made since the last call"""
+        print(f"📊 Created {self._stats['nodes_created']} nodes and "
+              f"{self._stats['relationships_created']} relationships")
+        self._stats.clear()
+        
+    def _queue_node(self, labels: Optional[List[str]], properties: Optional[Dict[str, Any]]) -> int:
+        """Record node metadata and queue it for the next flush"""
+        labels = labels if labels else _EMPTY_TUPLE
+        properties = properties if properties else _EMPTY_DICT
+        
+        self._node_labels.append(labels)
+        self._node_props.append(properties)
+        node_id = len(self._node_labels)
+        self._stats['nodes_created'] += 1
+        
+        for label in labels:
+            self._by_label[label].add(node_id)
+        for key, value in properties.items():
+            try:
+                self._by_prop[(key, value)].add(node_id)
+            except TypeError:
+                pass  # Unhashable values are matched by scanning in match_nodes
+        
+        # Label sets repeat across nodes, so only the properties are encoded per row
+        labels_json = _cached_dumps(tuple(labels))
+        props_json = _dumps(properties) if properties else "{}"
+        self._pending_nodes.append(
+            (node_id, f'{{"labels":{labels_json},"properties":{props_json}}}'))
+        return node_id
+        
+    def _queue_relationship(self, from_node: int, to_node: int, rel_type: str,
+                            properties: Optional[Dict[str, Any]]) -> int:
+        """Record relationship metadata and queue it for the next flush"""
+        properties = properties if properties else _EMPTY_DICT
+        
         edge_id = self.next_edge_id
         self.next_edge_id += 1
+        self._stats['relationships_created'] += 1
         
         # Store metadata
-        self.relationships[edge_id] = {
-            'type': rel_type,
-            'properties': properties or {},
-            'from_id': from_node,
-            'to_id': to_node
-        }
-        
-        # Create in graph database
-        edge_data = {
-            'type': rel_type,
-            'properties': properties or {}
-        }
-        
-        self.cursor.execute("SELECT graph_edge_add(?, ?, ?, ?) as result",
-                           (from_node, to_node, rel_type, json.dumps(edge_data)))
-        result = self.cursor.fetchone()
-        
-        print(f"🔗 Created relationship {edge_id}: ({from_node})-[:{rel_type}]->({to_node})")
+        self.relationships[edge_id] = _Edge(rel_type, properties, from_node, to_node)
+        self._out[from_node].add(edge_id)
+        self._in[to_node].add(edge_id)
+        self._by_type[rel_type].add(edge_id)
+        
+        type_json = _cached_dumps(rel_type)
+        props_json = _dumps(properties) if properties else "{}"
+        self._pending_edges.append(
+            (int(from_node), int(to_node),
+             f'{{"type":{type_json},"properties":{props_json}}}'))
         return edge_id
         
     def match_nodes(self, labels: List[str] = None, properties: Dict[str, Any] = None) -> List[int]:
         """Find nodes matching criteria (Cypher: MATCH (n:Label {props}))"""
-        matching_nodes = []
-        
-        for node_id, node_data in self.nodes.items():
-            # Check labels
-            if labels:
-                if not all(label in node_data['labels'] for label in labels):
-                    continue
-                    
-            # Check properties
-            if properties:
-                node_props = node_data['properties']
-                if not all(node_props.get(k) == v for k, v in properties.items()):
-                    continue
-                    
-            matching_nodes.append(node_id)
+        candidates = None
+        unindexed = {}
+        
+        # Intersect the label index
+        for label in labels or _EMPTY_TUPLE:
+            ids = self._by_label.get(label, set())
+            candidates = ids.copy() if candidates is None else candidates & ids
             
-        print(f"🔍 Found {len(matching_nodes)} nodes matching criteria")
+        # Intersect the property index
+        for key, value in (properties or _EMPTY_DICT).items():
+            # None also matches nodes without the key, which the index
+            # does not list
+            if value is None:
+                unindexed[key] = value
+                continue
+            try:
+                ids = self._by_prop.get((key, value), set())
+            except TypeError:
+                unindexed[key] = value
+                continue
+            candidates = ids.copy() if candidates is None else candidates & ids
+            
+        if candidates is None:
+            candidates = range(1, len(self._node_labels) + 1)
+            
+        # Check properties that could not be indexed
+        if unindexed:
+            pred = _property_predicate(tuple(unindexed))
+            values = tuple(unindexed.values())
+            node_props = self._node_props
+            candidates = [node_id for node_id in candidates
+                          if pred(node_props[node_id - 1], values)]
+            
+        matching_nodes = sorted(candidates)
+        if __debug__ and self._verbose:
+            print(f"🔍 Found {len(matching_nodes)} nodes matching criteria")
         return matching_nodes
         
     def get_relationships(self, from_node: int = None, to_node: int = None, 
                          rel_type: str = None) -> List[Dict]:
         """Find relationships matching criteria (Cypher: MATCH ()-[r:TYPE]->())"""
+        filters = []
+        if from_node:
+            filters.append(self._out.get(from_node, set()))
+        if to_node:
+            filters.append(self._in.get(to_node, set()))
+        if rel_type:
+            filters.append(self._by_type.get(rel_type, set()))
+            
+        # Seed with the smallest applicable set and intersect the rest
+        if filters:
+            filters.sort(key=len)
+            edge_ids = sorted(filters[0].intersection(*filters[1:]))
+        else:
+            edge_ids = list(self.relationships)
+            
         matching_rels = []
-        
-        for edge_id, rel_data in self.relationships.items():
-            if from_node and rel_data['from_id'] != from_node:
-                continue
-            if to_node and rel_data['to_id'] != to_node:
-                continue
-            if rel_type and rel_data['type'] != rel_type:
-                continue
-                
+        for edge_id in edge_ids:
+            rel_data = self.relationships[edge_id]
             matching_rels.append({
                 'id': edge_id,
-                'from': rel_data['from_id'],
-                'to': rel_data['to_id'],
-                'type': rel_data['type'],
-                'properties': rel_data['properties']
+                'from': rel_data.from_id,
+                'to': rel_data.to_id,
+                'type': rel_data.type,
+                'properties': rel_data.properties
             })
             
-        print(f"🔍 Found {len(matching_rels)} relationships matching criteria")
+        if __debug__ and self._verbose:
+            print(f"🔍 Found {len(matching_rels)} relationships matching criteria")
         return matching_rels
         
     # Graph Algorithms (Working)
     def shortest_path(self, from_node: int, to_node: int) -> Optional[str]:
         """Find shortest path between nodes (Cypher: shortestPath((a)-[*]-(b)))"""
         try:
-            self.cursor.execute("SELECT graph_shortest_path(?, ?) as path", (from_node, to_node))
-            result = self.cursor.fetchone()
-            return result['path'] if result['path'] else None
+            return self._shortest_path_cached(from_node, to_node)
         except sqlite3.Error as e:
             print(f"ℹ️  Shortest path: {e}")
             return None
             
     def node_degree_centrality(self, node_id: int) -> float:
         """Calculate node centrality (Cypher extension)"""
+        if self._deg_version != self._version:
+            self._compute_degree_centrality()
+        if 0 < node_id < len(self._deg_cache):
+            return self._deg_cache[node_id]
+            
+        # Not created through this instance; ask the extension
         try:
-            self.cursor.execute("SELECT graph_degree_centrality(?) as centrality", (node_id,))
-            result = self.cursor.fetchone()
-            return float(result['centrality'])
+            return self._centrality_cached(node_id)
         except sqlite3.Error as e:
             print(f"ℹ️  Centrality: {e}")
             return 0.0
             
+    def _compute_degree_centrality(self):
+        """Fill the centrality array for every known node in one pass over the edges"""
+        degree = array.array('d', bytes(8 * (len(self._node_labels) + 1)))
+        size = len(degree)
+        for rel in self.relationships.values():
+            if 0 < rel.from_id < size:
+                degree[rel.from_id] += 1
+            if rel.to_id != rel.from_id and 0 < rel.to_id < size:
+                degree[rel.to_id] += 1
+                
+        # Degree centrality = degree / (n-1), as computed by graph_degree_centrality()
+        n = len(self._node_labels)
+        if n > 1:
+            for node_id in range(1, len(degree)):
+                degree[node_id] /= n - 1
+        else:
+            degree = array.array('d', bytes(8 * size))
+            
+        self._deg_cache = degree
+        self._deg_version = self._version
+        
+    def _query_shortest_path(self, from_node: int, to_node: int) -> Optional[str]:
+        self.cursor.execute("SELECT graph_shortest_path(?, ?)", (from_node, to_node))
+        path = self.cursor.fetchone()[0]
+        return path if path else None
+        
+    def _query_degree_centrality(self, node_id: int) -> float:
+        self.cursor.execute("SELECT graph_degree_centrality(?)", (node_id,))
+        return float(self.cursor.fetchone()[0])
+            
     def graph_stats(self) -> Dict[str, Any]:
         """Get graph statistics (Cypher: RETURN count(n), count(r))"""
-        stats = {}
-        
         try:
-            self.cursor.execute("SELECT graph_count_nodes() as nodes, graph_count_edges() as edges")
-            result = self.cursor.fetchone()
-            stats['nodes'] = result['nodes']
-            stats['edges'] = result['edges']
+            self.cursor.execute("SELECT graph_count_nodes(), graph_count_edges(), "
+                                "graph_density(), graph_is_connected()")
+            nodes, edges, density, connected = self.cursor.fetchone()
+            return {
+                'nodes': nodes,
+                'edges': edges,
+                'density': float(density),
+                'connected': bool(connected)
+            }
         except sqlite3.Error as e:
             print(f"ℹ️  Graph stats: {e}")
-            stats['nodes'] = len(self.nodes)
-            stats['edges'] = len(self.relationships)
+            return {
+                'nodes': len(self._node_labels),
+                'edges': len(self.relationships),
+                'density': 0.0,
+                'connected': False
+            }
             
-        try:
-            self.cursor.execute("SELECT graph_density() as density")
-            result = self.cursor.fetchone()
-            stats['density'] = float(result['density'])
-        except sqlite3.Error as e:
-            stats['density'] = 0.0
-            
-        try:
-            self.cursor.execute("SELECT graph_is_connected() as connected")
-            result = self.cursor.fetchone()
-            stats['connected'] = bool(result['connected'])
-        except sqlite3.Error as e:
-            stats['connected'] = False
-            
-        return stats
-        
     # Cypher-like Query Interface (Demonstration)
     def cypher_query(self, query: str) -> List[Dict]:
         """
@@ -221,112 +492,104 @@ class CypherGraphDB:
         This is a simplified parser for common Cypher patterns.
         In the full implementation, this would use the Cypher parser and executor.
         """
-        query = query.strip()
+        query = _WHITESPACE_RE.sub(lambda m: m.group(1) or " ", query).strip()
         
-        # Simple CREATE node pattern
-        if query.startswith("CREATE (") and "):" in query and "{" in query:
-            # Example: CREATE (n:Person {name: 'Alice', age: 30})
-            return self._parse_create_node(query)
-            
-        # Simple MATCH pattern  
-        elif query.startswith("MATCH (") and "RETURN" in query:
-            # Example: MATCH (n:Person) RETURN n
-            return self._parse_match_return(query)
-            
-        # Simple CREATE relationship pattern
-        elif query.startswith("CREATE (") and ")-[" in query and "]->(" in query:
-            # Example: CREATE (a)-[r:KNOWS]->(b)  
-            return self._parse_create_relationship(query)
-            
-        else:
+        plan = self._plan(query)
+        if plan is None:
             print(f"⚠️  Query pattern not yet implemented: {query}")
             return []
             
-    def _parse_create_node(self, query: str) -> List[Dict]:
-        """Parse CREATE (n:Label {props}) pattern"""
-        try:
-            # Extract label
-            label_start = query.find(":") + 1
-            label_end = query.find(" ", label_start)
-            if label_end == -1:
-                label_end = query.find("{", label_start)
-            label = query[label_start:label_end].strip()
-            
-            # Extract properties (simplified)
-            props_start = query.find("{") + 1
-            props_end = query.rfind("}")
-            props_str = query[props_start:props_end]
-            
-            # Parse simple properties (name: 'value', age: 30)
-            properties = {}
-            if props_str.strip():
-                for prop in props_str.split(","):
-                    if ":" in prop:
-                        key, value = prop.split(":", 1)
-                        key = key.strip().strip("'\"")
-                        value = value.strip().strip("'\"")
-                        # Try to convert to appropriate type
-                        try:
-                            if value.isdigit():
-                                properties[key] = int(value)
-                            elif value.replace(".", "").isdigit():
-                                properties[key] = float(value)
-                            else:
-                                properties[key] = value
-                        except:
-                            properties[key] = value
-            
-            # Create the node
-            node_id = self.create_node([label], properties)
-            return [{'node_id': node_id, 'action': 'created'}]
-            
-        except Exception as e:
-            print(f"❌ Error parsing CREATE query: {e}")
-            return []
-            
-    def _parse_match_return(self, query: str) -> List[Dict]:
-        """Parse MATCH (n:Label) RETURN n pattern"""
-        try:
-            # Extract label if present
-            labels = []
-            if ":" in query:
-                label_start = query.find(":") + 1
-                label_end = query.find(")", label_start)
-                label = query[label_start:label_end].strip()
-                if label:
-                    labels = [label]
-            
-            # Find matching nodes
-            node_ids = self.match_nodes(labels)
-            
-            # Return node data
-            results = []
-            for node_id in node_ids:
-                node_data = self.nodes[node_id]
-                results.append({
-                    'node_id': node_id,
-                    'labels': node_data['labels'],
-                    'properties': node_data['properties']
-                })
-                
-            return results
-            
-        except Exception as e:
-            print(f"❌ Error parsing MATCH query: {e}")
-            return []
-            
-    def _parse_create_relationship(self, query: str) -> List[Dict]:
-        """Parse CREATE (a)-[r:TYPE]->(b) pattern (simplified)"""
-        print(f"⚠️  CREATE relationship parsing not fully implemented yet")
+        handler, match = plan
+        return handler(self, match)
+        
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _plan(query: str) -> Optional[Tuple[Callable, re.Match]]:
+        """
+        Resolve a whitespace-normalized query to its handler and parsed match.
+        
+        Parsing is independent of the graph contents, so plans are shared by
+        every instance and never need invalidating. Case is left alone because
+        it is significant inside property values.
+        """
+        for pattern, handler in _QUERY_HANDLERS:
+            match = pattern.match(query)
+            if match:
+                return handler, match
+        return None
+
+
+def _parse_create_node(db: 'CypherGraphDB', match: re.Match) -> List[Dict]:
+    """Parse CREATE (n:Label {props}) pattern"""
+    try:
+        # Rewrite simple properties (name: 'value', age: 30) as a JSON
+        # object and let the JSON parser type the values in one call
+        members = []
+        for key, single, double, number, word in _PROP_RE.findall(match['props']):
+            if number:
+                # JSON rejects leading zeros (zip: 02134); store the value
+                value = (str(int(number)) if number.lstrip('-').isdigit()
+                         else repr(float(number)))
+            elif word.lower() in _JSON_LITERALS:
+                value = _JSON_LITERALS[word.lower()]
+            else:
+                value = _dumps(single or double or word)
+            members.append(f"{_dumps(key)}:{value}")
+        properties = _loads("{" + ",".join(members) + "}")
+
+        # Create the node
+        node_id = db.create_node([match['label']], properties)
+        return [{'node_id': node_id, 'action': 'created'}]
+
+    except Exception as e:
+        print(f"❌ Error parsing CREATE query: {e}")
+        return []
+
+
+def _parse_match_return(db: 'CypherGraphDB', match: re.Match) -> List[Dict]:
+    """Parse MATCH (n:Label) RETURN n pattern"""
+    try:
+        labels = [match['label']] if match['label'] else []
+
+        # Find matching nodes
+        node_ids = db.match_nodes(labels)
+
+        # Return node data
+        results = []
+        for node_id in node_ids:
+            results.append({
+                'node_id': node_id,
+                'labels': db._node_labels[node_id - 1],
+                'properties': db._node_props[node_id - 1]
+            })
+
+        return results
+
+    except Exception as e:
+        print(f"❌ Error parsing MATCH query: {e}")
         return []
 
 
+def _parse_create_relationship(db: 'CypherGraphDB', match: re.Match) -> List[Dict]:
+    """Parse CREATE (a)-[r:TYPE]->(b) pattern (simplified)"""
+    print(f"⚠️  CREATE relationship parsing not fully implemented yet")
+    return []
+
+
+# Checked in order; the first pattern that matches handles the query
+_QUERY_HANDLERS = (
+    (_CREATE_NODE_RE, _parse_create_node),
+    (_MATCH_RETURN_RE, _parse_match_return),
+    (_CREATE_RELATIONSHIP_RE, _parse_create_relationship),
+)
+
+
 def demo_cypher_operations():
     """Demonstrate Cypher-like operations using the graph extension."""
     print("🎯 SQLite Graph Extension - Cypher Operations Demo")
     print("=" * 60)
     
-    with CypherGraphDB() as db:
+    with CypherGraphDB(verbose=True) as db:
         # Create nodes using Cypher-like syntax
         print("\n1. Creating nodes with Cypher-like operations:")
         
@@ -364,6 +627,10 @@ def demo_cypher_operations():
         print(f"   Found {len(friendships)} friendships")
         
         # Graph algorithms
+        # Steps 7-9 are independent but deliberately run in sequence: the
+        # extension routes every connection through its single global graph
+        # handle, so worker threads would only queue on that connection, and
+        # centrality is answered from the in-memory degree array anyway.
         print("\n7. Running graph algorithms:")
         stats = db.graph_stats()
         print(f"   Graph statistics: {stats}")
@@ -382,6 +649,9 @@ def demo_cypher_operations():
         print(f"   Alice centrality: {alice_centrality:.3f}")
         print(f"   Bob centrality: {bob_centrality:.3f}")
         print(f"   Carol centrality: {carol_centrality:.3f}")
+        
+        print()
+        db.flush_stats()
 
 
 def demo_roadmap():
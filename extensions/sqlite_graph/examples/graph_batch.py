@@ -0,0 +1,19 @@
+"""
+Batched insert statements shared by the example scripts.
+
+sqlite3's executemany() only accepts DML, so a batch of graph_node_add() /
+graph_edge_add() calls is passed as one JSON array and expanded by json_each.
+Node rows are [id, properties]; edge rows are [from_id, to_id, weight,
+properties] with an optional fifth bidirectional flag.
+"""
+
+NODE_BATCH_SQL = (
+    "SELECT count(graph_node_add(json_extract(value, '$[0]'), "
+    "json_extract(value, '$[1]'))) FROM json_each(?)"
+)
+EDGE_BATCH_SQL = (
+    "SELECT count(graph_edge_add(json_extract(value, '$[0]'), "
+    "json_extract(value, '$[1]'), json_extract(value, '$[2]'), "
+    "json_extract(value, '$[3]'), ifnull(json_extract(value, '$[4]'), 0))) "
+    "FROM json_each(?)"
+)
@@ -16,6 +16,9 @@ import sqlite3
 import json
 import os
 
+# Batched graph_node_add / graph_edge_add calls, one statement per batch
+from graph_batch import NODE_BATCH_SQL, EDGE_BATCH_SQL
+
 
 def main():
     # Connect to SQLite (in-memory database)
@@ -55,12 +58,12 @@ def main():
         (3, {"name": "Carol", "age": 28, "city": "Chicago"}),
         (4, {"name": "Dave", "age": 32, "city": "Austin"})
     ]
+    people_by_id = dict(people)
     
+    cursor.execute(NODE_BATCH_SQL, (json.dumps(
+        [(person_id, json.dumps(data)) for person_id, data in people]),))
     for person_id, data in people:
-        cursor.execute("SELECT graph_node_add(?, ?) as result", 
-                      (person_id, json.dumps(data)))
-        result = cursor.fetchone()
-        print(f"Created {data['name']} (ID: {person_id}): {result['result']}")
+        print(f"Created {data['name']} (ID: {person_id})")
     
     # Create relationships
     print("\n🤝 Creating relationships...")
@@ -71,13 +74,13 @@ def main():
         (3, 4, "FRIENDS", {"since": "2021"})
     ]
     
+    cursor.execute(EDGE_BATCH_SQL, (json.dumps(
+        [(from_id, to_id, 1.0, json.dumps({"type": rel_type, **data}))
+         for from_id, to_id, rel_type, data in relationships]),))
     for from_id, to_id, rel_type, data in relationships:
-        cursor.execute("SELECT graph_edge_add(?, ?, ?, ?) as result",
-                      (from_id, to_id, rel_type, json.dumps(data)))
-        result = cursor.fetchone()
-        from_name = next(p[1]['name'] for p in people if p[0] == from_id)
-        to_name = next(p[1]['name'] for p in people if p[0] == to_id)
-        print(f"{from_name} -> {to_name} ({rel_type}): {result['result']}")
+        from_name = people_by_id[from_id]['name']
+        to_name = people_by_id[to_id]['name']
+        print(f"{from_name} -> {to_name} ({rel_type})")
     
     # Check graph statistics
     print("\n📊 Graph Statistics:")
@@ -111,6 +111,7 @@ typedef struct CypherToken {
 // Lexer context structure
 struct CypherLexer {
     const char *zInput;
+    int nInput;              // Length of zInput in bytes
     int iPos;
     int iLine;
     int iColumn;
@@ -226,6 +227,7 @@ struct CypherParser {
 CypherParser *cypherParserCreate(void);
 void cypherParserDestroy(CypherParser *pParser);
 CypherAst *cypherParse(CypherParser *pParser, const char *zQuery, char **pzErrMsg);
+int cypherValidateCached(const char *zQuery, char **pzErr);
 
 // SQL Function Registration
 int cypherRegisterSqlFunctions(sqlite3 *db);
@@ -129,12 +129,26 @@ typedef struct OptimizedNode {
 /* Compressed sparse row format for edges */
 typedef struct CSRGraph {
     sqlite3_int64 *rowOffsets;   /* Row offset array */
-    sqlite3_int64 *columnIndices;/* Column indices array */
+    sqlite3_int64 *columnIndices;/* Column indices array (row numbers) */
     double *edgeWeights;         /* Edge weights array */
+    sqlite3_int64 *nodeIds;      /* Node id of each row */
+    int *nodeDegrees;            /* In+out degree of each row */
+    sqlite3_int64 *rowsById;     /* Rows in ascending id order, or NULL
+                                 ** while rows themselves are in id order */
     sqlite3_int64 nNodes;        /* Number of nodes */
     sqlite3_int64 nEdges;        /* Number of edges */
 } CSRGraph;
 
+/*
+** Traversal fields of one CSR row. Node properties are never loaded into
+** the snapshot, so BFS and centrality only walk these packed columns.
+*/
+typedef struct NodeHot {
+    sqlite3_int64 nodeId;        /* Node ID */
+    sqlite3_int64 offset;        /* First out-edge in columnIndices */
+    int degree;                  /* In+out degree, self-loops once */
+} NodeHot;
+
 /*
 ** Benchmarking Infrastructure
 */
@@ -188,6 +202,12 @@ int graphParallelPatternMatch(GraphVtab *pGraph, CypherAst *pattern,
 
 /* Storage optimization */
 CSRGraph* graphConvertToCSR(GraphVtab *pGraph);
+sqlite3_int64 graphCSRRow(const CSRGraph *csr, sqlite3_int64 iNodeId);
+int graphCSRNodeHot(const CSRGraph *csr, sqlite3_int64 iNodeId, NodeHot *pHot);
+void graphDestroyCSR(CSRGraph *csr);
+int graphReorderCSR(CSRGraph *csr, int nWindow);
+CSRGraph *graphCurrentCSR(void);
+sqlite3_int64 graphDataVersion(GraphVtab *pVtab);
 char* graphCompressProperties(const char *zProperties);
 int graphDeltaEncodeEdges(sqlite3_int64 *edges, int nEdges);
 
@@ -226,6 +246,15 @@ void graphPlanCacheStats(sqlite3_int64 *hits, sqlite3_int64 *misses,
 void graphPlanCacheClear(void);
 void graphPlanCacheShutdown(void);
 int graphRegisterPlanCacheFunctions(sqlite3 *db);
+
+/* Adjacency cache operations */
+int graphAdjCacheNeighbors(sqlite3_int64 iNodeId,
+                           sqlite3_int64 **paOut, int *pnOut);
+int graphAdjCacheDegree(sqlite3_int64 iNodeId, int *pnDegree);
+void graphAdjCacheInvalidateEdge(sqlite3_int64 iVersion, sqlite3_int64 iFromId,
+                                 sqlite3_int64 iToId);
+void graphAdjCacheReset(void);
+int graphRegisterAdjacencyCacheFunctions(sqlite3 *db);
 int graphRegisterBenchmarkFunctions(sqlite3 *db);
 
 #endif /* GRAPH_PERFORMANCE_H */
\ No newline at end of file
@@ -350,6 +350,17 @@ GraphNode *graphFindNodesByLabel(GraphVtab *pVtab, const char *zLabel);
 */
 GraphEdge *graphFindEdgesByType(GraphVtab *pVtab, const char *zType);
 
+/*
+** Direct entry points for graph_node_add() and graph_edge_add().
+** Operate on the default graph without going through SQL, for hosts that
+** can call into the loaded library (e.g. Python ctypes).
+** Return the new node/edge id, or -1 on error.
+*/
+sqlite3_int64 graph_node_add_direct(sqlite3_int64 iNodeId,
+                                    const char *zProperties);
+sqlite3_int64 graph_edge_add_direct(sqlite3_int64 iFromId, sqlite3_int64 iToId,
+                                    double rWeight, const char *zProperties);
+
 /*
 ** Thread-safe global graph access functions.
 ** Used to manage the global graph variable in a thread-safe manner.
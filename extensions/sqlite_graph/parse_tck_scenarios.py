@@ -4,50 +4,103 @@ import os
 import re
 import json
 import csv
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from operator import attrgetter
 from pathlib import Path
-from typing import Dict, List, Set, Tuple
+from typing import Any, Dict, List, NamedTuple, Optional, Set, Tuple
 
-def parse_feature_file(file_path: str) -> List[Dict]:
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import re2
+except ImportError:
+    re2 = None
+
+TCK_FEATURES_DIR = 'openCypher-master/tck/features'
+
+class Scenario(NamedTuple):
+    """One TCK scenario; fields are in manifest column order."""
+    scenario_id: str
+    scenario_name: str
+    scenario_type: str
+    feature_name: str
+    file_path: str
+    language_area: str
+    requires_runtime: bool
+
+# Feature line and scenario header, matched at the start of a line
+_FEATURE_RE = re.compile(r'Feature:\s*(.+)$')
+_SCENARIO_RE = re.compile(r'  (Scenario(?: Outline)?):\s*(.+)$')
+
+# Gherkin step keywords; runtime indicators are only looked for in steps
+_STEP_KEYWORDS = ('Given ', 'When ', 'Then ', 'And ', 'But ', '* ')
+
+def parse_feature_file(file_path: Path) -> List[Scenario]:
     """Parse a single feature file and extract scenario information."""
     scenarios = []
     
+    # Stream the file once: headers are collected line by line and only
+    # the step lines, where the runtime indicators live, are kept
+    feature_name = None
+    scenarios_found = []
+    step_lines = []
     with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
+        for line in f:
+            # The prefix test picks the one pattern that can match
+            if line.startswith('  Scenario'):
+                match = _SCENARIO_RE.match(line)
+                if match:
+                    scenarios_found.append(match.groups())
+            elif feature_name is None and line.startswith('Feature:'):
+                match = _FEATURE_RE.match(line)
+                if match:
+                    feature_name = match.group(1).strip()
+            else:
+                step = line.lstrip()
+                if step.startswith(_STEP_KEYWORDS):
+                    step_lines.append(step)
+    if feature_name is None:
+        feature_name = "Unknown"
     
-    # Extract feature name
-    feature_match = re.search(r'^Feature:\s*(.+)$', content, re.MULTILINE)
-    feature_name = feature_match.group(1).strip() if feature_match else "Unknown"
+    # The runtime heuristic looks at the step lines of the whole file, so
+    # it is shared by every scenario in it; comments and descriptions are
+    # ignored. Parse/validate indicators take precedence; otherwise runtime
+    # indicators, database setup or query execution mean the scenarios
+    # need runtime
+    markers = runtime_markers(''.join(step_lines))
+    requires_runtime = not (markers & _PARSE) and bool(markers & (_RUNTIME | _SETUP))
     
-    # Find all scenarios (including scenario outlines)
-    scenario_pattern = r'^  (Scenario|Scenario Outline):\s*(.+)$'
-    scenarios_found = re.findall(scenario_pattern, content, re.MULTILINE)
+    # Path-derived fields are the same for every scenario in the file
+    relative_path = Path(file_path).relative_to(TCK_FEATURES_DIR).as_posix()
+    id_prefix = '-'.join(relative_path.replace('.feature', '').split('/'))
+    
+    # Determine language area based on directory structure
+    language_area = determine_language_area(relative_path)
     
     for i, (scenario_type, scenario_name) in enumerate(scenarios_found):
-        # Generate a scenario ID
-        relative_path = os.path.relpath(file_path, 'openCypher-master/tck/features')
-        path_parts = relative_path.replace('.feature', '').split('/')
-        scenario_id = f"{'-'.join(path_parts)}-{i+1:02d}"
-        
-        # Determine language area based on directory structure
-        language_area = determine_language_area(relative_path)
-        
-        # Check if scenario requires runtime execution
-        requires_runtime = check_requires_runtime(content, scenario_name)
-        
-        scenario_info = {
-            'scenario_id': scenario_id,
-            'scenario_name': scenario_name.strip(),
-            'scenario_type': scenario_type,
-            'feature_name': feature_name,
-            'file_path': relative_path,
-            'language_area': language_area,
-            'requires_runtime': requires_runtime
-        }
-        
-        scenarios.append(scenario_info)
+        scenarios.append(Scenario(
+            scenario_id=f"{id_prefix}-{i+1:02d}",
+            scenario_name=scenario_name.strip(),
+            scenario_type=scenario_type,
+            feature_name=feature_name,
+            file_path=relative_path,
+            language_area=language_area,
+            requires_runtime=requires_runtime
+        ))
     
     return scenarios
 
+def _parse_feature_file_safe(file_path: Path) -> Tuple[Path, List[Scenario], Optional[str]]:
+    """Worker wrapper for parse_feature_file that returns errors instead of raising."""
+    try:
+        return file_path, parse_feature_file(file_path), None
+    except Exception as e:
+        return file_path, [], str(e)
+
 def determine_language_area(file_path: str) -> str:
     """Determine the language area based on file path."""
     parts = file_path.split('/')
@@ -61,51 +114,77 @@ def determine_language_area(file_path: str) -> str:
     
     return "unknown"
 
-def check_requires_runtime(content: str, scenario_name: str) -> bool:
+# Markers of scenarios that must run against a database
+_RUNTIME_INDICATORS = [
+    r'\bAnd the result should be\b',
+    r'\bThen the result should be\b',
+    r'\bAnd the side effects should be\b',
+    r'\bThen the side effects should be\b',
+    r'\bWhen executing query\b',
+    r'\bAnd executing query\b',
+    r'\bThen a \w+Error should be raised\b',
+    r'\bAnd a \w+Error should be raised\b',
+    r'\bno side effects\b',
+    r'\brows in any order\b',
+    r'\brows in order\b'
+]
+
+# Markers of scenarios that only need parsing/validation
+_PARSE_VALIDATE_INDICATORS = [
+    r'\bThen a SyntaxError should be raised\b',
+    r'\bAnd a SyntaxError should be raised\b',
+    r'\bshould fail to parse\b',
+    r'\bparse error\b'
+]
+
+# Each group is compiled once as a single alternation, so a file is scanned
+# once per group rather than once per indicator
+def _compile_indicators(patterns: List[str]):
+    """Compile patterns as one case-insensitive alternation, using RE2's
+    linear-time engine when it is installed."""
+    return (re2 or re).compile('(?i)' + '|'.join(patterns))
+
+_RUNTIME_RE = _compile_indicators(_RUNTIME_INDICATORS)
+_PARSE_RE = _compile_indicators(_PARSE_VALIDATE_INDICATORS)
+_SETUP_RE = _compile_indicators([r'\bGiven an empty graph\b', r'\bGiven any graph\b',
+                                 r'\bWhen executing query\b'])
+
+# Lower-case literals that each group's matches must contain; when none is
+# present the regex cannot match and is skipped
+_PARSE_HINTS = ('syntaxerror', 'fail to parse', 'parse error')
+_RUNTIME_HINTS = ('result should be', 'side effects', 'executing query',
+                  'error should be raised', 'rows in')
+_SETUP_HINTS = ('given an empty graph', 'given any graph', 'executing query')
+
+# Indicator groups reported by runtime_markers()
+_PARSE, _RUNTIME, _SETUP = 1, 2, 4
+
+def runtime_markers(text: str) -> int:
     """
-    Check if a scenario requires runtime execution vs pure parse/validate.
-    This is a heuristic based on common patterns.
+    Return the indicator groups (_PARSE, _RUNTIME, _SETUP) present in text
+    from a feature file. This is a heuristic based on common patterns.
     """
-    runtime_indicators = [
-        r'\bAnd the result should be\b',
-        r'\bThen the result should be\b',
-        r'\bAnd the side effects should be\b',
-        r'\bThen the side effects should be\b',
-        r'\bWhen executing query\b',
-        r'\bAnd executing query\b',
-        r'\bThen a \w+Error should be raised\b',
-        r'\bAnd a \w+Error should be raised\b',
-        r'\bno side effects\b',
-        r'\brows in any order\b',
-        r'\brows in order\b'
-    ]
-    
-    parse_validate_indicators = [
-        r'\bThen a SyntaxError should be raised\b',
-        r'\bAnd a SyntaxError should be raised\b',
-        r'\bshould fail to parse\b',
-        r'\bparse error\b'
-    ]
-    
-    # Check for parse/validate indicators first (they take precedence)
-    for indicator in parse_validate_indicators:
-        if re.search(indicator, content, re.IGNORECASE):
-            return False
-    
-    # Check for runtime indicators
-    for indicator in runtime_indicators:
-        if re.search(indicator, content, re.IGNORECASE):
-            return True
-    
-    # Default assumption: if it has database setup or query execution, it needs runtime
-    if re.search(r'\bGiven an empty graph\b|\bGiven any graph\b|\bWhen executing query\b', content, re.IGNORECASE):
-        return True
-    
-    return False
+    lowered = text.lower()
+    markers = 0
+    if any(hint in lowered for hint in _PARSE_HINTS) and _PARSE_RE.search(text):
+        markers |= _PARSE
+    if any(hint in lowered for hint in _RUNTIME_HINTS) and _RUNTIME_RE.search(text):
+        markers |= _RUNTIME
+    if any(hint in lowered for hint in _SETUP_HINTS) and _SETUP_RE.search(text):
+        markers |= _SETUP
+    return markers
+
+def write_json(path: str, data: Any) -> None:
+    """Write data as indented JSON, using orjson's C encoder when it is installed."""
+    if orjson is not None:
+        Path(path).write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        return
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2)
 
 def main():
     """Main function to process all feature files."""
-    tck_features_dir = 'openCypher-master/tck/features'
+    tck_features_dir = TCK_FEATURES_DIR
     
     if not os.path.exists(tck_features_dir):
         print(f"Error: TCK features directory not found: {tck_features_dir}")
@@ -113,16 +192,17 @@ def main():
     
     all_scenarios = []
     
-    # Walk through all feature files
-    for root, dirs, files in os.walk(tck_features_dir):
-        for file in files:
-            if file.endswith('.feature'):
-                file_path = os.path.join(root, file)
-                try:
-                    scenarios = parse_feature_file(file_path)
-                    all_scenarios.extend(scenarios)
-                except Exception as e:
-                    print(f"Error processing {file_path}: {e}")
+    # Collect all feature files, then parse them in parallel; map() keeps
+    # the sorted path order so the output does not depend on scheduling
+    paths = sorted(Path(tck_features_dir).rglob('*.feature'))
+    
+    with ProcessPoolExecutor() as executor:
+        for file_path, scenarios, error in executor.map(_parse_feature_file_safe, paths,
+                                                        chunksize=32):
+            if error is not None:
+                print(f"Error processing {file_path}: {error}")
+            else:
+                all_scenarios.extend(scenarios)
     
     # Generate commit info
     commit_info = {
@@ -132,22 +212,20 @@ def main():
     }
     
     # Group scenarios by language area
-    scenarios_by_area = {}
+    scenarios_by_area = defaultdict(list)
     for scenario in all_scenarios:
-        area = scenario['language_area']
-        if area not in scenarios_by_area:
-            scenarios_by_area[area] = []
-        scenarios_by_area[area].append(scenario)
+        scenarios_by_area[scenario.language_area].append(scenario)
     
     # Create summary statistics
     summary = {
         'commit_info': commit_info,
         'language_areas': {},
-        'scenarios_by_area': scenarios_by_area
+        'scenarios_by_area': {area: [s._asdict() for s in scenarios]
+                              for area, scenarios in scenarios_by_area.items()}
     }
     
     for area, scenarios in scenarios_by_area.items():
-        runtime_count = sum(1 for s in scenarios if s['requires_runtime'])
+        runtime_count = sum(1 for s in scenarios if s.requires_runtime)
         parse_count = len(scenarios) - runtime_count
         
         summary['language_areas'][area] = {
@@ -157,27 +235,13 @@ def main():
         }
     
     # Write JSON manifest
-    with open('tck_scenarios_manifest.json', 'w') as f:
-        json.dump(summary, f, indent=2)
+    write_json('tck_scenarios_manifest.json', summary)
     
     # Write CSV manifest
     with open('tck_scenarios_manifest.csv', 'w', newline='') as f:
         writer = csv.writer(f)
-        writer.writerow([
-            'scenario_id', 'scenario_name', 'scenario_type', 'feature_name',
-            'file_path', 'language_area', 'requires_runtime'
-        ])
-        
-        for scenario in sorted(all_scenarios, key=lambda x: (x['language_area'], x['scenario_id'])):
-            writer.writerow([
-                scenario['scenario_id'],
-                scenario['scenario_name'],
-                scenario['scenario_type'],
-                scenario['feature_name'],
-                scenario['file_path'],
-                scenario['language_area'],
-                scenario['requires_runtime']
-            ])
+        writer.writerow(Scenario._fields)
+        writer.writerows(sorted(all_scenarios, key=attrgetter('language_area', 'scenario_id')))
     
     # Print summary
     print(f"OpenCypher TCK Scenarios Analysis")
@@ -6,6 +6,7 @@ Demo script showing the complete TCK coverage system in action.
 import json
 import subprocess
 import os
+from collections import defaultdict
 
 def main():
     print("=== TCK Coverage Matrix Demo ===\n")
@@ -50,14 +51,12 @@ def main():
     
     # Show feature group coverage
     print("5. Coverage by Feature Group:")
-    groups = {}
+    groups = defaultdict(lambda: {'total': 0, 'passed': 0})
     for scenario in coverage['scenarios']:
-        group = scenario['feature_group']
-        if group not in groups:
-            groups[group] = {'total': 0, 'passed': 0}
-        groups[group]['total'] += 1
+        data = groups[scenario['feature_group']]
+        data['total'] += 1
         if scenario.get('status') == 'pass':
-            groups[group]['passed'] += 1
+            data['passed'] += 1
     
     for group, data in sorted(groups.items())[:10]:  # Show first 10 groups
         pct = (data['passed'] / data['total']) * 100 if data['total'] > 0 else 0
@@ -6,8 +6,14 @@ This script calculates the running compliance percentage based on test results.
 
 import json
 import sys
+from collections import Counter
 from typing import Dict, Any
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 def calculate_compliance(coverage_data: Dict[str, Any]) -> float:
     """Calculate compliance percentage from scenario results."""
     stats = coverage_data.get('statistics', {})
@@ -23,37 +29,44 @@ def update_statistics(coverage_data: Dict[str, Any]) -> None:
     """Update statistics based on current scenario statuses."""
     scenarios = coverage_data.get('scenarios', [])
     
-    stats = {
-        'total_scenarios': len(scenarios),
-        'passed': 0,
-        'failed': 0,
-        'skipped': 0,
-        'pending': 0
-    }
-    
-    for scenario in scenarios:
-        status = scenario.get('status', 'pending')
-        if status == 'pass':
-            stats['passed'] += 1
-        elif status == 'fail':
-            stats['failed'] += 1
-        elif status == 'skip':
-            stats['skipped'] += 1
-        else:
-            stats['pending'] += 1
+    counts = Counter(scenario.get('status', 'pending') for scenario in scenarios)
+    total = len(scenarios)
+    passed = counts['pass']
+    failed = counts['fail']
+    skipped = counts['skip']
     
-    stats['compliance_percentage'] = calculate_compliance({'statistics': stats})
-    coverage_data['statistics'] = stats
+    # Any other status counts as pending
+    coverage_data['statistics'] = {
+        'total_scenarios': total,
+        'passed': passed,
+        'failed': failed,
+        'skipped': skipped,
+        'pending': total - passed - failed - skipped,
+        'compliance_percentage': (passed / total) * 100.0 if total else 0.0
+    }
+
+def load_coverage(path: str) -> Dict[str, Any]:
+    """Read coverage.json, using orjson's C decoder when it is installed."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+def save_coverage(path: str, coverage_data: Dict[str, Any]) -> None:
+    """Write coverage.json, using orjson's C encoder when it is installed."""
+    if orjson is not None:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(coverage_data, option=orjson.OPT_INDENT_2))
+        return
+    with open(path, 'w') as f:
+        json.dump(coverage_data, f, indent=2)
 
 def main():
     try:
-        with open('coverage.json', 'r') as f:
-            coverage_data = json.load(f)
+        coverage_data = load_coverage('coverage.json')
         
         update_statistics(coverage_data)
         
-        with open('coverage.json', 'w') as f:
-            json.dump(coverage_data, f, indent=2)
+        save_coverage('coverage.json', coverage_data)
         
         stats = coverage_data['statistics']
         print(f"TCK Compliance Report:")
@@ -1,28 +1,67 @@
+import csv
+import json
 import os
+import random
 import sqlite3
+import sys
+from typing import Optional
+
 import click
 import sqlite_utils
 
 
+# Sample rows are sent in batches, one JSON array per statement
+_NODE_BATCH_SQL = (
+    "SELECT count(graph_node_add(json_extract(value, '$[0]'), "
+    "json_extract(value, '$[1]'))) FROM json_each(?)"
+)
+_EDGE_BATCH_SQL = (
+    "SELECT count(graph_edge_add(json_extract(value, '$[0]'), "
+    "json_extract(value, '$[1]'), json_extract(value, '$[2]'), "
+    "json_extract(value, '$[3]'))) FROM json_each(?)"
+)
+_SAMPLE_BATCH_SIZE = 5000
+
+
+# Possible locations of the graph extension, in search order
+_EXTENSION_PATHS = [
+    "./build/libgraph.so",  # Local build
+    "./libgraph.so",  # Current directory
+    "/usr/local/lib/libgraph.so",  # System-wide install
+    "/usr/lib/libgraph.so",  # Alternative system location
+]
+
+# The path that last loaded successfully, tried first on later connections
+_cached_extension_path: Optional[str] = None
+
+
+def _load_extension(conn, path: str) -> bool:
+    """Load the extension at path into conn, returning whether it worked."""
+    try:
+        conn.enable_load_extension(True)
+    except (AttributeError, sqlite3.OperationalError):
+        pass  # Already enabled, or unsupported; load_extension() will tell
+    try:
+        conn.load_extension(path)
+    except Exception:
+        return False
+    return True
+
+
 @sqlite_utils.hookimpl
 def prepare_connection(conn):
     """Load the SQLite graph extension when a connection is created."""
-    # Try to load the extension from various possible locations
-    extension_paths = [
-        "./build/libgraph.so",  # Local build
-        "./libgraph.so",  # Current directory
-        "/usr/local/lib/libgraph.so",  # System-wide install
-        "/usr/lib/libgraph.so",  # Alternative system location
-    ]
+    global _cached_extension_path
     
-    for path in extension_paths:
-        if os.path.exists(path):
-            try:
-                conn.enable_load_extension(True)
-                conn.load_extension(path)
-                return
-            except Exception as e:
-                continue
+    # Reuse the last working path without probing the filesystem again
+    if _cached_extension_path and _load_extension(conn, _cached_extension_path):
+        return
+    
+    # Try to load the extension from various possible locations
+    for path in _EXTENSION_PATHS:
+        if os.path.exists(path) and _load_extension(conn, path):
+            _cached_extension_path = path
+            return
     
     # If no extension found, warn the user
     click.echo(
@@ -68,32 +107,27 @@ def register_commands(cli):
                 # Execute the Cypher query using the cypher_execute function
                 cursor = db.conn.execute("SELECT cypher_execute(?) as result", (cypher,))
                 results = cursor.fetchall()
+                column_names = [desc[0] for desc in cursor.description] if cursor.description else []
                 
                 if output == "json":
-                    import json
                     # Convert results to JSON format
-                    column_names = [desc[0] for desc in cursor.description] if cursor.description else []
                     json_results = [dict(zip(column_names, row)) for row in results]
                     click.echo(json.dumps(json_results, indent=2))
                 elif output == "csv":
-                    import csv
-                    import sys
                     writer = csv.writer(sys.stdout)
-                    if cursor.description:
-                        writer.writerow([desc[0] for desc in cursor.description])
+                    if column_names:
+                        writer.writerow(column_names)
                     writer.writerows(results)
                 else:
-                    # Table format (default)
+                    # Table format (default), written with a single echo
                     if results:
+                        lines = []
                         # Print column headers if available
-                        if cursor.description:
-                            headers = [desc[0] for desc in cursor.description]
-                            click.echo("\t".join(headers))
-                            click.echo("\t".join(["-" * len(h) for h in headers]))
-                        
-                        # Print rows
-                        for row in results:
-                            click.echo("\t".join(str(cell) for cell in row))
+                        if column_names:
+                            lines.append("\t".join(column_names))
+                            lines.append("\t".join("-" * len(h) for h in column_names))
+                        lines.extend("\t".join(map(str, row)) for row in results)
+                        click.echo("\n".join(lines))
                     else:
                         click.echo("No results returned.")
                         
@@ -140,28 +174,56 @@ def register_commands(cli):
             click.echo(f"Error creating graph table: {e}", err=True)
             return
         
-        # Create sample nodes
-        if nodes:
-            import json
-            click.echo(f"Creating {nodes} sample nodes...")
-            for i in range(nodes):
-                node_data = {"name": f"Person_{i}", "id": i}
-                db.conn.execute("SELECT graph_node_add(?, ?) as result", (i, json.dumps(node_data)))
-        
-        # Create sample edges
-        if edges and nodes:
-            import random
-            click.echo(f"Creating {edges} sample edges...")
-            for i in range(edges):
-                from_id = random.randint(0, nodes - 1)
-                to_id = random.randint(0, nodes - 1)
-                if from_id != to_id:
-                    edge_data = {"relationship": "KNOWS"}
+        # The extension's INSERTs would otherwise each autocommit; one
+        # explicit transaction covers all sample rows
+        with db.conn:
+            db.conn.execute("BEGIN")
+            
+            # Create sample nodes
+            if nodes:
+                click.echo(f"Creating {nodes} sample nodes...")
+                rows = [[i, json.dumps({"name": f"Person_{i}", "id": i})] for i in range(nodes)]
+                for start in range(0, len(rows), _SAMPLE_BATCH_SIZE):
+                    db.conn.execute(_NODE_BATCH_SQL,
+                                    (json.dumps(rows[start:start + _SAMPLE_BATCH_SIZE]),))
+            
+            # Create sample edges, skipping self-loops
+            if edges and nodes:
+                click.echo(f"Creating {edges} sample edges...")
+                edge_data = json.dumps({"relationship": "KNOWS"})
+                # Imported here so other commands don't pay NumPy's import time
+                try:
+                    import numpy as np
+                except ImportError:
+                    np = None
+                if np is not None:
+                    # Draw all endpoint pairs in one vectorized call
+                    ends = np.random.randint(0, nodes, size=(edges, 2), dtype=np.int64)
+                    ends = ends[ends[:, 0] != ends[:, 1]]
+                    rows = [[from_id, to_id, "KNOWS", edge_data]
+                            for from_id, to_id in ends.tolist()]
+                else:
+                    rows = []
+                    for i in range(edges):
+                        from_id = random.randint(0, nodes - 1)
+                        to_id = random.randint(0, nodes - 1)
+                        if from_id != to_id:
+                            rows.append([from_id, to_id, "KNOWS", edge_data])
+                for start in range(0, len(rows), _SAMPLE_BATCH_SIZE):
+                    batch = rows[start:start + _SAMPLE_BATCH_SIZE]
+                    # A failing edge is skipped, not fatal: undo the batch
+                    # and replay it one edge at a time
+                    db.conn.execute("SAVEPOINT sample_edges")
                     try:
-                        db.conn.execute("SELECT graph_edge_add(?, ?, ?, ?) as result", 
-                                      (from_id, to_id, "KNOWS", json.dumps(edge_data)))
-                    except:
-                        pass  # Ignore duplicate edges
+                        db.conn.execute(_EDGE_BATCH_SQL, (json.dumps(batch),))
+                    except sqlite3.Error:
+                        db.conn.execute("ROLLBACK TO sample_edges")
+                        for row in batch:
+                            try:
+                                db.conn.execute("SELECT graph_edge_add(?, ?, ?, ?)", row)
+                            except sqlite3.Error:
+                                pass
+                    db.conn.execute("RELEASE sample_edges")
         
         click.echo("Sample data created successfully!")
 
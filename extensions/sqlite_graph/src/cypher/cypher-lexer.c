@@ -36,9 +36,36 @@ extern const sqlite3_api_routines *sqlite3_api;
 #include "cypher.h"
 #include <string.h>
 #include <stdio.h>
-#include <ctype.h>
 #include <stdarg.h>
 
+// Character classes for the scanner: one table lookup per input byte instead
+// of locale-dependent ctype calls. Bytes >= 0x80 belong to no class.
+#define CC_SPACE 0x01   // Whitespace
+#define CC_DIGIT 0x02   // 0-9
+#define CC_IDENT 0x04   // Letter or '_', may start an identifier
+static const unsigned char aCypherCharClass[256] = {
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x01, 0x01, 0x01, 0x01, 0x01, 0x00, 0x00,  // 00..0f
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,  // 10..1f
+    0x01, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,  // 20..2f
+    0x02, 0x02, 0x02, 0x02, 0x02, 0x02, 0x02, 0x02, 0x02, 0x02, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,  // 30..3f
+    0x00, 0x04, 0x04, 0x04, 0x04, 0x04, 0x04, 0x04, 0x04, 0x04, 0x04, 0x04, 0x04, 0x04, 0x04, 0x04,  // 40..4f
+    0x04, 0x04, 0x04, 0x04, 0x04, 0x04, 0x04, 0x04, 0x04, 0x04, 0x04, 0x00, 0x00, 0x00, 0x00, 0x04,  // 50..5f
+    0x00, 0x04, 0x04, 0x04, 0x04, 0x04, 0x04, 0x04, 0x04, 0x04, 0x04, 0x04, 0x04, 0x04, 0x04, 0x04,  // 60..6f
+    0x04, 0x04, 0x04, 0x04, 0x04, 0x04, 0x04, 0x04, 0x04, 0x04, 0x04, 0x00, 0x00, 0x00, 0x00, 0x00,  // 70..7f
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,  // 80..8f
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,  // 90..9f
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,  // a0..af
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,  // b0..bf
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,  // c0..cf
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,  // d0..df
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,  // e0..ef
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,  // f0..ff
+};
+#define lexerIsSpace(c) (aCypherCharClass[(unsigned char)(c)] & CC_SPACE)
+#define lexerIsDigit(c) (aCypherCharClass[(unsigned char)(c)] & CC_DIGIT)
+#define lexerIsIdentStart(c) (aCypherCharClass[(unsigned char)(c)] & CC_IDENT)
+#define lexerIsIdentChar(c) (aCypherCharClass[(unsigned char)(c)] & (CC_IDENT|CC_DIGIT))
+
 // Initializes a new lexer instance.
 CypherLexer *cypherLexerCreate(const char *zInput) {
     if (!zInput) {
@@ -50,6 +77,7 @@ CypherLexer *cypherLexerCreate(const char *zInput) {
     }
     
     pLexer->zInput = zInput;
+    pLexer->nInput = (int)strlen(zInput);
     pLexer->iPos = 0;
     pLexer->iLine = 1;
     pLexer->iColumn = 1;
@@ -71,7 +99,8 @@ void cypherLexerDestroy(CypherLexer *pLexer) {
 }
 
 static char lexerPeek(CypherLexer *pLexer, int offset) {
-    if (pLexer->iPos + offset >= (int)strlen(pLexer->zInput)) {
+    // Length is measured once at creation; strlen() here made lexing O(n^2)
+    if (pLexer->iPos + offset >= pLexer->nInput) {
         return '\0';
     }
     return pLexer->zInput[pLexer->iPos + offset];
@@ -90,7 +119,7 @@ static char lexerNext(CypherLexer *pLexer) {
 }
 
 static void lexerSkipWhitespace(CypherLexer *pLexer) {
-    while (isspace(lexerPeek(pLexer, 0))) {
+    while (lexerIsSpace(lexerPeek(pLexer, 0))) {
         lexerNext(pLexer);
     }
 }
@@ -215,7 +244,7 @@ static CypherTokenType cypherGetKeywordToken(const char *zKeyword, size_t len) {
 
 static CypherToken *lexerTokenizeIdentifier(CypherLexer *pLexer) {
     int startPos = pLexer->iPos;
-    while (isalnum(lexerPeek(pLexer, 0)) || lexerPeek(pLexer, 0) == '_') {
+    while (lexerIsIdentChar(lexerPeek(pLexer, 0))) {
         lexerNext(pLexer);
     }
     int endPos = pLexer->iPos;
@@ -226,13 +255,13 @@ static CypherToken *lexerTokenizeIdentifier(CypherLexer *pLexer) {
 static CypherToken *lexerTokenizeNumber(CypherLexer *pLexer) {
     int startPos = pLexer->iPos;
     CypherTokenType type = CYPHER_TOK_INTEGER;
-    while (isdigit(lexerPeek(pLexer, 0))) {
+    while (lexerIsDigit(lexerPeek(pLexer, 0))) {
         lexerNext(pLexer);
     }
     if (lexerPeek(pLexer, 0) == '.') {
         type = CYPHER_TOK_FLOAT;
         lexerNext(pLexer);
-        while (isdigit(lexerPeek(pLexer, 0))) {
+        while (lexerIsDigit(lexerPeek(pLexer, 0))) {
             lexerNext(pLexer);
         }
     }
@@ -270,11 +299,11 @@ CypherToken *cypherLexerNextToken(CypherLexer *pLexer) {
         return lexerAddToken(pLexer, CYPHER_TOK_EOF, startPos, pLexer->iPos);
     }
 
-    if (isalpha(c) || c == '_') {
+    if (lexerIsIdentStart(c)) {
         return lexerTokenizeIdentifier(pLexer);
     }
 
-    if (isdigit(c)) {
+    if (lexerIsDigit(c)) {
         return lexerTokenizeNumber(pLexer);
     }
 
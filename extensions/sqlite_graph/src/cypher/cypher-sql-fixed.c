@@ -14,9 +14,153 @@ extern const sqlite3_api_routines *sqlite3_api;
 #include <string.h>
 #include <stdlib.h>
 
+/*
+** Parse cache: query text -> AST.
+** cypher_parse(), cypher_validate() and cypher_ast_info() all parse the same
+** query strings over and over (test suites, example scripts), so parses are
+** memoized by query text. Each entry owns the parser that owns its AST; a
+** NULL AST records a failed parse. The least recently used entry is dropped
+** when the cache is full.
+**
+** The cache is shared by every connection in the process, so all access,
+** including reading a cached AST, happens while holding parseCache.mutex.
+*/
+#define CYPHER_PARSE_CACHE_ENTRIES 64
+#define CYPHER_PARSE_CACHE_BUCKETS 128
+
+typedef struct CypherParseCacheEntry CypherParseCacheEntry;
+struct CypherParseCacheEntry {
+  char *zQuery;                       /* Query text (owned copy) */
+  CypherParser *pParser;              /* Parser owning pAst */
+  CypherAst *pAst;                    /* Parsed AST, NULL if invalid */
+  CypherParseCacheEntry *pHashNext;   /* Next entry in hash chain */
+  CypherParseCacheEntry *pLruPrev;    /* More recently used entry */
+  CypherParseCacheEntry *pLruNext;    /* Less recently used entry */
+};
+
+static struct {
+  CypherParseCacheEntry *aBucket[CYPHER_PARSE_CACHE_BUCKETS];
+  CypherParseCacheEntry *pLruHead;    /* Most recently used */
+  CypherParseCacheEntry *pLruTail;    /* Least recently used */
+  int nEntry;
+  sqlite3_int64 nHit;                 /* Lookups answered from the cache */
+  sqlite3_int64 nMiss;                /* Lookups that had to parse */
+  sqlite3_mutex *mutex;               /* Guards everything above */
+} parseCache;
+
+static unsigned int cypherParseCacheHash(const char *zQuery) {
+  unsigned int h = 5381;
+  int c;
+  while( (c = *zQuery++) ) h = ((h << 5) + h) + c;
+  return h % CYPHER_PARSE_CACHE_BUCKETS;
+}
+
+static void cypherParseCacheLruRemove(CypherParseCacheEntry *pEntry) {
+  if( pEntry->pLruPrev ) pEntry->pLruPrev->pLruNext = pEntry->pLruNext;
+  else parseCache.pLruHead = pEntry->pLruNext;
+  if( pEntry->pLruNext ) pEntry->pLruNext->pLruPrev = pEntry->pLruPrev;
+  else parseCache.pLruTail = pEntry->pLruPrev;
+}
+
+static void cypherParseCacheUnlink(CypherParseCacheEntry *pEntry) {
+  CypherParseCacheEntry **pp = &parseCache.aBucket[cypherParseCacheHash(pEntry->zQuery)];
+  while( *pp!=pEntry ) pp = &(*pp)->pHashNext;
+  *pp = pEntry->pHashNext;
+  cypherParseCacheLruRemove(pEntry);
+  parseCache.nEntry--;
+}
+
+static void cypherParseCacheFree(CypherParseCacheEntry *pEntry) {
+  cypherParserDestroy(pEntry->pParser);
+  sqlite3_free(pEntry->zQuery);
+  sqlite3_free(pEntry);
+}
+
+static void cypherParseCachePushFront(CypherParseCacheEntry *pEntry) {
+  pEntry->pLruPrev = 0;
+  pEntry->pLruNext = parseCache.pLruHead;
+  if( parseCache.pLruHead ) parseCache.pLruHead->pLruPrev = pEntry;
+  parseCache.pLruHead = pEntry;
+  if( !parseCache.pLruTail ) parseCache.pLruTail = pEntry;
+}
+
+/*
+** Return the cache entry for zQuery, parsing it on a miss.
+** Returns NULL only when out of memory. The caller must hold
+** parseCache.mutex until it is done with the entry.
+*/
+static CypherParseCacheEntry *cypherParseCacheGet(const char *zQuery) {
+  unsigned int iBucket = cypherParseCacheHash(zQuery);
+  CypherParseCacheEntry *pEntry;
+  
+  for( pEntry = parseCache.aBucket[iBucket]; pEntry; pEntry = pEntry->pHashNext ){
+    if( strcmp(pEntry->zQuery, zQuery)==0 ){
+      if( parseCache.pLruHead!=pEntry ){
+        cypherParseCacheLruRemove(pEntry);
+        cypherParseCachePushFront(pEntry);
+      }
+      parseCache.nHit++;
+      return pEntry;
+    }
+  }
+  
+  pEntry = sqlite3_malloc(sizeof(*pEntry));
+  if( !pEntry ) return 0;
+  memset(pEntry, 0, sizeof(*pEntry));
+  pEntry->zQuery = sqlite3_mprintf("%s", zQuery);
+  pEntry->pParser = cypherParserCreate();
+  if( !pEntry->zQuery || !pEntry->pParser ){
+    if( pEntry->pParser ) cypherParserDestroy(pEntry->pParser);
+    sqlite3_free(pEntry->zQuery);
+    sqlite3_free(pEntry);
+    return 0;
+  }
+  pEntry->pAst = cypherParse(pEntry->pParser, zQuery, NULL);
+  parseCache.nMiss++;
+  
+  if( parseCache.nEntry>=CYPHER_PARSE_CACHE_ENTRIES ){
+    CypherParseCacheEntry *pVictim = parseCache.pLruTail;
+    cypherParseCacheUnlink(pVictim);
+    cypherParseCacheFree(pVictim);
+  }
+  pEntry->pHashNext = parseCache.aBucket[iBucket];
+  parseCache.aBucket[iBucket] = pEntry;
+  parseCache.nEntry++;
+  cypherParseCachePushFront(pEntry);
+  return pEntry;
+}
+
+/*
+** Validate zQuery through the parse cache. Returns 1 if it parses, 0 if not
+** and -1 when out of memory. On 0, *pzErr is set to a copy of the parser's
+** message (NULL if it has none) that the caller frees with sqlite3_free().
+*/
+int cypherValidateCached(const char *zQuery, char **pzErr) {
+  CypherParseCacheEntry *pEntry;
+  int rc;
+  
+  *pzErr = 0;
+  sqlite3_mutex_enter(parseCache.mutex);
+  pEntry = cypherParseCacheGet(zQuery);
+  if( !pEntry ){
+    rc = -1;
+  }else if( pEntry->pAst ){
+    rc = 1;
+  }else{
+    rc = 0;
+    if( pEntry->pParser->zErrorMsg ){
+      *pzErr = sqlite3_mprintf("%s", pEntry->pParser->zErrorMsg);
+      if( !*pzErr ) rc = -1;
+    }
+  }
+  sqlite3_mutex_leave(parseCache.mutex);
+  return rc;
+}
+
 /*
 ** SQL function: cypher_parse(query_text)
-** Simple placeholder that just echoes the query
+** Simple placeholder that just echoes the query. The query is parsed into
+** the parse cache so later validation of the same text is a lookup.
 */
 static void cypherParseSqlFunc(
   sqlite3_context *context,
@@ -37,6 +181,15 @@ static void cypherParseSqlFunc(
     return;
   }
   
+  /* Parse into the cache so a following cypher_validate() is a lookup */
+  sqlite3_mutex_enter(parseCache.mutex);
+  if( !cypherParseCacheGet(zQuery) ) {
+    sqlite3_mutex_leave(parseCache.mutex);
+    sqlite3_result_error_nomem(context);
+    return;
+  }
+  sqlite3_mutex_leave(parseCache.mutex);
+  
   /* Simple echo for now */
   zResult = sqlite3_mprintf("Query: %s", zQuery);
   if( !zResult ) {
@@ -57,8 +210,7 @@ static void cypherValidateSqlFunc(
   sqlite3_value **argv
 ) {
   const char *zQuery;
-  CypherParser *pParser = NULL;
-  CypherAst *pAst = NULL;
+  CypherParseCacheEntry *pEntry;
   
   if( argc != 1 ) {
     sqlite3_result_error(context, "cypher_validate() requires exactly 1 argument", -1);
@@ -71,22 +223,17 @@ static void cypherValidateSqlFunc(
     return;
   }
   
-  /* Create parser and validate query */
-  pParser = cypherParserCreate();
-  if( !pParser ) {
+  /* Validate query, reusing a cached parse when there is one */
+  sqlite3_mutex_enter(parseCache.mutex);
+  pEntry = cypherParseCacheGet(zQuery);
+  if( !pEntry ) {
     sqlite3_result_error_nomem(context);
-    return;
-  }
-  
-  pAst = cypherParse(pParser, zQuery, NULL);
-  
-  if( pAst != NULL ) {
+  } else if( pEntry->pAst != NULL ) {
     sqlite3_result_int(context, 1); /* Valid */
   } else {
     sqlite3_result_int(context, 0); /* Invalid */
   }
-  
-  cypherParserDestroy(pParser);
+  sqlite3_mutex_leave(parseCache.mutex);
 }
 
 /*
@@ -201,8 +348,8 @@ static void cypherAstInfoSqlFunc(
   sqlite3_value **argv
 ) {
   const char *zQuery;
-  CypherParser *pParser = NULL;
-  CypherAst *pAst = NULL;
+  CypherParseCacheEntry *pEntry;
+  CypherAst *pAst;
   char *zResult;
   
   if( argc != 1 ) {
@@ -216,14 +363,18 @@ static void cypherAstInfoSqlFunc(
     return;
   }
   
-  /* Create parser and parse query */
-  pParser = cypherParserCreate();
-  if( !pParser ) {
+  /* Parse query, reusing a cached parse when there is one. The AST may be
+  ** evicted by another connection once the mutex is released, so the
+  ** result is rendered while still holding it. */
+  sqlite3_mutex_enter(parseCache.mutex);
+  pEntry = cypherParseCacheGet(zQuery);
+  if( !pEntry ) {
+    sqlite3_mutex_leave(parseCache.mutex);
     sqlite3_result_error_nomem(context);
     return;
   }
   
-  pAst = cypherParse(pParser, zQuery, NULL);
+  pAst = pEntry->pAst;
   
   if( pAst ) {
     /* Build comprehensive result */
@@ -242,14 +393,65 @@ static void cypherAstInfoSqlFunc(
       "Validation: FAILED"
     );
   }
+  sqlite3_mutex_leave(parseCache.mutex);
+  
+  if( !zResult ) {
+    sqlite3_result_error_nomem(context);
+  } else {
+    sqlite3_result_text(context, zResult, -1, sqlite3_free);
+  }
+}
+
+/*
+** SQL function: cypher_parse_cache_stats()
+** Returns {"hits":N,"misses":N,"entries":N} for the parse cache.
+*/
+static void cypherParseCacheStatsSqlFunc(
+  sqlite3_context *context,
+  int argc,
+  sqlite3_value **argv
+) {
+  char *zResult;
+  (void)argc;
+  (void)argv;
+  
+  sqlite3_mutex_enter(parseCache.mutex);
+  zResult = sqlite3_mprintf("{\"hits\":%lld,\"misses\":%lld,\"entries\":%d}",
+                            parseCache.nHit, parseCache.nMiss, parseCache.nEntry);
+  sqlite3_mutex_leave(parseCache.mutex);
   
   if( !zResult ) {
     sqlite3_result_error_nomem(context);
   } else {
     sqlite3_result_text(context, zResult, -1, sqlite3_free);
   }
+}
+
+/*
+** SQL function: cypher_parse_cache_clear()
+** Drops every cached parse and resets the hit/miss counters. Returns the
+** number of entries dropped.
+*/
+static void cypherParseCacheClearSqlFunc(
+  sqlite3_context *context,
+  int argc,
+  sqlite3_value **argv
+) {
+  int nDropped;
+  (void)argc;
+  (void)argv;
+  
+  sqlite3_mutex_enter(parseCache.mutex);
+  nDropped = parseCache.nEntry;
+  while( parseCache.pLruHead ) {
+    CypherParseCacheEntry *pEntry = parseCache.pLruHead;
+    cypherParseCacheUnlink(pEntry);
+    cypherParseCacheFree(pEntry);
+  }
+  parseCache.nHit = parseCache.nMiss = 0;
+  sqlite3_mutex_leave(parseCache.mutex);
   
-  cypherParserDestroy(pParser);
+  sqlite3_result_int(context, nDropped);
 }
 
 /*
@@ -257,6 +459,13 @@ static void cypherAstInfoSqlFunc(
 */
 int cypherRegisterSqlFunctions(sqlite3 *db) {
   int rc = SQLITE_OK;
+  sqlite3_mutex *pMaster;
+  
+  /* Connections may register concurrently; create the cache mutex once */
+  pMaster = sqlite3_mutex_alloc(SQLITE_MUTEX_STATIC_MASTER);
+  sqlite3_mutex_enter(pMaster);
+  if( !parseCache.mutex ) parseCache.mutex = sqlite3_mutex_alloc(SQLITE_MUTEX_FAST);
+  sqlite3_mutex_leave(pMaster);
   
   /* Register cypher_parse function */
   rc = sqlite3_create_function(db, "cypher_parse", 1, 
@@ -282,5 +491,17 @@ int cypherRegisterSqlFunctions(sqlite3 *db) {
                               0, cypherAstInfoSqlFunc, 0, 0);
   if( rc != SQLITE_OK ) return rc;
   
+  /* Register cypher_parse_cache_clear function */
+  rc = sqlite3_create_function(db, "cypher_parse_cache_clear", 0,
+                              SQLITE_UTF8, 0,
+                              cypherParseCacheClearSqlFunc, 0, 0);
+  if( rc != SQLITE_OK ) return rc;
+  
+  /* Register cypher_parse_cache_stats function */
+  rc = sqlite3_create_function(db, "cypher_parse_cache_stats", 0,
+                              SQLITE_UTF8, 0,
+                              cypherParseCacheStatsSqlFunc, 0, 0);
+  if( rc != SQLITE_OK ) return rc;
+  
   return SQLITE_OK;
 }
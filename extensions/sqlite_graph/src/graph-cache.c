@@ -488,4 +488,428 @@ int graphRegisterPlanCacheFunctions(sqlite3 *db) {
                                 planCacheClearFunc, NULL, NULL);
     
     return rc;
-}
\ No newline at end of file
+}
+
+/*
+** Adjacency cache
+**
+** Keeps the out-neighbor list and total degree of recently used nodes so
+** repeated graph_shortest_path() / graph_degree_centrality() calls do not
+** re-query the edge table. Replacement approximates LRU-K with K=2: entries
+** seen once and entries seen at least twice sit on separate recency lists,
+** and the victim is the least recently used entry seen once, or, when every
+** entry has been revisited, the least recently used of those. Nodes touched
+** once by a one-off lookup are thus evicted before nodes that traversals keep
+** revisiting, and picking a victim is O(1).
+**
+** All access goes through g_adjCache.mutex. The cache is tied to one graph
+** and to graphDataVersion() of its connection; graph_edge_add() invalidates
+** just the two endpoints of the new edge, and any other change to the
+** database, by this connection or another, flushes the whole cache, as does
+** a rollback. Inside a transaction entries are read but never filled, since
+** ROLLBACK TO a savepoint cannot be observed.
+*/
+#define ADJ_CACHE_ENTRIES 1024
+#define ADJ_CACHE_BUCKETS 2048
+
+typedef struct AdjCacheEntry {
+    sqlite3_int64 iNodeId;       /* Cached node */
+    sqlite3_int64 *aOut;         /* Out-neighbors, in edge table order */
+    int nOut;                    /* Number of out-neighbors, -1 if unknown */
+    int nDegree;                 /* In + out degree, -1 if unknown */
+    int nAccess;                 /* 1 if seen once, 2 if seen again */
+    struct AdjCacheEntry *pNext; /* Next entry in hash chain */
+    struct AdjCacheEntry *pLruNext;  /* Next (less recent) entry in list */
+    struct AdjCacheEntry *pLruPrev;  /* Previous (more recent) entry */
+} AdjCacheEntry;
+
+typedef struct AdjCacheList {
+    AdjCacheEntry *pHead;        /* Most recently used */
+    AdjCacheEntry *pTail;        /* Least recently used */
+} AdjCacheList;
+
+typedef struct AdjCache {
+    AdjCacheEntry *buckets[ADJ_CACHE_BUCKETS];
+    AdjCacheList aList[2];       /* [0] seen once, [1] seen at least twice */
+    int nEntries;                /* Current number of entries */
+    GraphVtab *pOwner;           /* Graph the entries were read from */
+    sqlite3_int64 iVersion;      /* graphDataVersion() when in sync */
+    sqlite3_mutex *mutex;        /* Thread safety */
+
+    /* Statistics */
+    sqlite3_int64 hits;          /* Lookups answered from the cache */
+    sqlite3_int64 misses;        /* Lookups that queried the edge table */
+    sqlite3_int64 evictions;     /* Entries evicted */
+    sqlite3_int64 invalidations; /* Entries dropped because edges changed */
+} AdjCache;
+
+static AdjCache g_adjCache;
+
+static unsigned int adjCacheHash(sqlite3_int64 iNodeId) {
+    return (unsigned int)(((sqlite3_uint64)iNodeId * 0x9E3779B97F4A7C15ULL) >> 40)
+           % ADJ_CACHE_BUCKETS;
+}
+
+static void adjCacheFreeEntry(AdjCacheEntry *entry) {
+    sqlite3_free(entry->aOut);
+    sqlite3_free(entry);
+}
+
+static void adjCacheListUnlink(AdjCacheEntry *entry) {
+    AdjCacheList *pList = &g_adjCache.aList[entry->nAccess - 1];
+    if (entry->pLruPrev) entry->pLruPrev->pLruNext = entry->pLruNext;
+    else pList->pHead = entry->pLruNext;
+    if (entry->pLruNext) entry->pLruNext->pLruPrev = entry->pLruPrev;
+    else pList->pTail = entry->pLruPrev;
+    entry->pLruNext = entry->pLruPrev = NULL;
+}
+
+static void adjCacheListPush(AdjCacheEntry *entry) {
+    AdjCacheList *pList = &g_adjCache.aList[entry->nAccess - 1];
+    entry->pLruPrev = NULL;
+    entry->pLruNext = pList->pHead;
+    if (pList->pHead) pList->pHead->pLruPrev = entry;
+    else pList->pTail = entry;
+    pList->pHead = entry;
+}
+
+/*
+** Unlink entry from its hash chain and recency list and free it.
+*/
+static void adjCacheRemove(AdjCacheEntry *entry) {
+    AdjCacheEntry **pp = &g_adjCache.buckets[adjCacheHash(entry->iNodeId)];
+    while (*pp != entry) pp = &(*pp)->pNext;
+    *pp = entry->pNext;
+    adjCacheListUnlink(entry);
+    adjCacheFreeEntry(entry);
+    g_adjCache.nEntries--;
+}
+
+/*
+** Drop every entry. Statistics are kept.
+*/
+static void adjCacheFlush(void) {
+    int i;
+    for (i = 0; i < ADJ_CACHE_BUCKETS; i++) {
+        AdjCacheEntry *entry = g_adjCache.buckets[i];
+        while (entry) {
+            AdjCacheEntry *next = entry->pNext;
+            adjCacheFreeEntry(entry);
+            entry = next;
+        }
+        g_adjCache.buckets[i] = NULL;
+    }
+    memset(g_adjCache.aList, 0, sizeof(g_adjCache.aList));
+    g_adjCache.nEntries = 0;
+}
+
+/*
+** Flush the cache if it was filled from another graph or the database has
+** changed since. iVersion is graphDataVersion() of pLocalGraph. The caller
+** must hold g_adjCache.mutex.
+*/
+static void adjCacheSync(GraphVtab *pLocalGraph, sqlite3_int64 iVersion) {
+    if (g_adjCache.pOwner != pLocalGraph || g_adjCache.iVersion != iVersion) {
+        adjCacheFlush();
+        g_adjCache.pOwner = pLocalGraph;
+        g_adjCache.iVersion = iVersion;
+    }
+}
+
+/*
+** Return the entry for iNodeId without recording an access, or NULL.
+*/
+static AdjCacheEntry *adjCacheFind(sqlite3_int64 iNodeId) {
+    AdjCacheEntry *entry = g_adjCache.buckets[adjCacheHash(iNodeId)];
+    while (entry && entry->iNodeId != iNodeId) entry = entry->pNext;
+    return entry;
+}
+
+/*
+** Evict the least recently used entry seen only once, or the least recently
+** used revisited entry if every entry has been revisited.
+*/
+static void adjCacheEvict(void) {
+    AdjCacheEntry *victim = g_adjCache.aList[0].pTail;
+    if (!victim) victim = g_adjCache.aList[1].pTail;
+    if (!victim) return;
+
+    adjCacheRemove(victim);
+    g_adjCache.evictions++;
+}
+
+/*
+** Find or create the entry for iNodeId and record the access.
+*/
+static AdjCacheEntry *adjCacheEntry(sqlite3_int64 iNodeId) {
+    unsigned int bucket = adjCacheHash(iNodeId);
+    AdjCacheEntry *entry = adjCacheFind(iNodeId);
+
+    if (!entry) {
+        if (g_adjCache.nEntries >= ADJ_CACHE_ENTRIES) adjCacheEvict();
+        entry = sqlite3_malloc(sizeof(AdjCacheEntry));
+        if (!entry) return NULL;
+        memset(entry, 0, sizeof(AdjCacheEntry));
+        entry->iNodeId = iNodeId;
+        entry->nOut = -1;
+        entry->nDegree = -1;
+        entry->nAccess = 1;
+        entry->pNext = g_adjCache.buckets[bucket];
+        g_adjCache.buckets[bucket] = entry;
+        g_adjCache.nEntries++;
+    } else {
+        adjCacheListUnlink(entry);
+        entry->nAccess = 2;
+    }
+
+    adjCacheListPush(entry);
+    return entry;
+}
+
+static sqlite3_int64 *adjCacheDup(const sqlite3_int64 *aIn, int nIn) {
+    sqlite3_int64 *aOut;
+    if (nIn <= 0) return NULL;
+    aOut = sqlite3_malloc(nIn * sizeof(sqlite3_int64));
+    if (aOut) memcpy(aOut, aIn, nIn * sizeof(sqlite3_int64));
+    return aOut;
+}
+
+/*
+** Read the out-neighbors of iNodeId from the edge table into a new array.
+*/
+static int adjCacheQueryNeighbors(GraphVtab *pLocalGraph, sqlite3_int64 iNodeId,
+                                  sqlite3_int64 **paOut, int *pnOut) {
+    sqlite3_stmt *pStmt;
+    sqlite3_int64 *aOut = NULL;
+    int nOut = 0, nAlloc = 0;
+    char *zSql = sqlite3_mprintf("SELECT to_id FROM %s_edges WHERE from_id = %lld",
+                                 pLocalGraph->zTableName, iNodeId);
+    if (!zSql) return SQLITE_NOMEM;
+    int rc = sqlite3_prepare_v2(pLocalGraph->pDb, zSql, -1, &pStmt, 0);
+    sqlite3_free(zSql);
+    if (rc != SQLITE_OK) return rc;
+
+    while (sqlite3_step(pStmt) == SQLITE_ROW) {
+        if (nOut == nAlloc) {
+            int nNew = nAlloc ? nAlloc * 2 : 8;
+            sqlite3_int64 *aNew = sqlite3_realloc(aOut, nNew * sizeof(sqlite3_int64));
+            if (!aNew) {
+                sqlite3_finalize(pStmt);
+                sqlite3_free(aOut);
+                return SQLITE_NOMEM;
+            }
+            aOut = aNew;
+            nAlloc = nNew;
+        }
+        aOut[nOut++] = sqlite3_column_int64(pStmt, 0);
+    }
+    sqlite3_finalize(pStmt);
+
+    *paOut = aOut;
+    *pnOut = nOut;
+    return SQLITE_OK;
+}
+
+/*
+** Count the edges into or out of iNodeId in the edge table.
+*/
+static int adjCacheQueryDegree(GraphVtab *pLocalGraph, sqlite3_int64 iNodeId,
+                               int *pnDegree) {
+    sqlite3_stmt *pStmt;
+    char *zSql = sqlite3_mprintf("SELECT count(*) FROM %s_edges WHERE from_id=%lld OR to_id=%lld",
+                                 pLocalGraph->zTableName, iNodeId, iNodeId);
+    if (!zSql) return SQLITE_NOMEM;
+    int rc = sqlite3_prepare_v2(pLocalGraph->pDb, zSql, -1, &pStmt, 0);
+    sqlite3_free(zSql);
+    if (rc != SQLITE_OK) return rc;
+
+    *pnDegree = 0;
+    if (sqlite3_step(pStmt) == SQLITE_ROW) {
+        *pnDegree = sqlite3_column_int(pStmt, 0);
+    }
+    sqlite3_finalize(pStmt);
+    return SQLITE_OK;
+}
+
+/*
+** Return the out-neighbors of iNodeId in *paOut / *pnOut. The array is a
+** copy owned by the caller, who must release it with sqlite3_free(); it is
+** NULL when the node has no out-neighbors.
+**
+** The edge table is queried with g_adjCache.mutex released: the graph's
+** connection has a mutex of its own, and another thread may hold it while
+** waiting for the cache.
+*/
+int graphAdjCacheNeighbors(sqlite3_int64 iNodeId,
+                           sqlite3_int64 **paOut, int *pnOut) {
+    GraphVtab *pLocalGraph = getGlobalGraph();
+    AdjCacheEntry *entry;
+    sqlite3_int64 *aOut = NULL;
+    int nOut = -1;
+    sqlite3_int64 iVersion;
+    int bFill, rc;
+
+    if (!pLocalGraph) return SQLITE_ERROR;
+    iVersion = graphDataVersion(pLocalGraph);
+    bFill = sqlite3_get_autocommit(pLocalGraph->pDb);
+
+    sqlite3_mutex_enter(g_adjCache.mutex);
+    adjCacheSync(pLocalGraph, iVersion);
+    entry = bFill ? adjCacheEntry(iNodeId) : adjCacheFind(iNodeId);
+    if (entry && entry->nOut >= 0) {
+        nOut = entry->nOut;
+        aOut = adjCacheDup(entry->aOut, nOut);
+        g_adjCache.hits++;
+    }
+    sqlite3_mutex_leave(g_adjCache.mutex);
+
+    if (nOut < 0) {
+        rc = adjCacheQueryNeighbors(pLocalGraph, iNodeId, &aOut, &nOut);
+        if (rc != SQLITE_OK) return rc;
+
+        /* Fill the entry unless the cache moved on while unlocked */
+        sqlite3_mutex_enter(g_adjCache.mutex);
+        g_adjCache.misses++;
+        entry = adjCacheFind(iNodeId);
+        if (bFill && entry && entry->nOut < 0 && g_adjCache.pOwner == pLocalGraph
+         && g_adjCache.iVersion == iVersion) {
+            entry->aOut = adjCacheDup(aOut, nOut);
+            if (entry->aOut || nOut == 0) entry->nOut = nOut;
+        }
+        sqlite3_mutex_leave(g_adjCache.mutex);
+    }
+
+    if (nOut > 0 && !aOut) return SQLITE_NOMEM;
+    *paOut = aOut;
+    *pnOut = nOut;
+    return SQLITE_OK;
+}
+
+/*
+** Return the number of edges into or out of iNodeId in *pnDegree.
+*/
+int graphAdjCacheDegree(sqlite3_int64 iNodeId, int *pnDegree) {
+    GraphVtab *pLocalGraph = getGlobalGraph();
+    AdjCacheEntry *entry;
+    int nDegree = -1;
+    sqlite3_int64 iVersion;
+    int bFill, rc;
+
+    if (!pLocalGraph) return SQLITE_ERROR;
+    iVersion = graphDataVersion(pLocalGraph);
+    bFill = sqlite3_get_autocommit(pLocalGraph->pDb);
+
+    sqlite3_mutex_enter(g_adjCache.mutex);
+    adjCacheSync(pLocalGraph, iVersion);
+    entry = bFill ? adjCacheEntry(iNodeId) : adjCacheFind(iNodeId);
+    if (entry && entry->nDegree >= 0) {
+        nDegree = entry->nDegree;
+        g_adjCache.hits++;
+    }
+    sqlite3_mutex_leave(g_adjCache.mutex);
+
+    if (nDegree < 0) {
+        rc = adjCacheQueryDegree(pLocalGraph, iNodeId, &nDegree);
+        if (rc != SQLITE_OK) return rc;
+
+        sqlite3_mutex_enter(g_adjCache.mutex);
+        g_adjCache.misses++;
+        entry = adjCacheFind(iNodeId);
+        if (bFill && entry && g_adjCache.pOwner == pLocalGraph
+         && g_adjCache.iVersion == iVersion) {
+            entry->nDegree = nDegree;
+        }
+        sqlite3_mutex_leave(g_adjCache.mutex);
+    }
+
+    *pnDegree = nDegree;
+    return SQLITE_OK;
+}
+
+/*
+** Called after an edge from iFromId to iToId was inserted, with iVersion
+** being graphDataVersion() from before the insert. If the cache was in
+** sync at that point only the two endpoints are dropped; otherwise the
+** next lookup flushes everything.
+*/
+void graphAdjCacheInvalidateEdge(sqlite3_int64 iVersion, sqlite3_int64 iFromId,
+                                 sqlite3_int64 iToId) {
+    GraphVtab *pLocalGraph = getGlobalGraph();
+    sqlite3_int64 aNode[2];
+    int i;
+
+    if (!pLocalGraph) return;
+    sqlite3_int64 iNow = graphDataVersion(pLocalGraph);
+
+    sqlite3_mutex_enter(g_adjCache.mutex);
+    if (g_adjCache.pOwner == pLocalGraph && g_adjCache.iVersion == iVersion) {
+        aNode[0] = iFromId;
+        aNode[1] = iToId;
+        for (i = 0; i < 2; i++) {
+            AdjCacheEntry *entry = adjCacheFind(aNode[i]);
+            if (entry) {
+                adjCacheRemove(entry);
+                g_adjCache.invalidations++;
+            }
+        }
+        g_adjCache.iVersion = iNow;
+    }
+    sqlite3_mutex_leave(g_adjCache.mutex);
+}
+
+/*
+** Drop every entry, e.g. after a rollback undid writes the cache may have
+** seen.
+*/
+void graphAdjCacheReset(void) {
+    sqlite3_mutex_enter(g_adjCache.mutex);
+    adjCacheFlush();
+    g_adjCache.pOwner = NULL;
+    sqlite3_mutex_leave(g_adjCache.mutex);
+}
+
+/*
+** SQL function: graph_cache_stats()
+** Returns adjacency cache statistics as JSON.
+*/
+static void adjCacheStatsFunc(
+    sqlite3_context *context,
+    int argc,
+    sqlite3_value **argv
+) {
+    (void)argc;
+    (void)argv;
+
+    sqlite3_mutex_enter(g_adjCache.mutex);
+    sqlite3_int64 lookups = g_adjCache.hits + g_adjCache.misses;
+    double hitRate = 0.0;
+
+    if (lookups > 0) {
+        hitRate = (double)g_adjCache.hits / lookups * 100.0;
+    }
+
+    char *result = sqlite3_mprintf(
+        "{\"hits\":%lld,\"misses\":%lld,\"entries\":%d,"
+        "\"evictions\":%lld,\"invalidations\":%lld,\"hit_rate\":%.1f}",
+        g_adjCache.hits, g_adjCache.misses, g_adjCache.nEntries,
+        g_adjCache.evictions, g_adjCache.invalidations, hitRate
+    );
+    sqlite3_mutex_leave(g_adjCache.mutex);
+
+    sqlite3_result_text(context, result, -1, sqlite3_free);
+}
+
+/*
+** Register adjacency cache SQL functions
+*/
+int graphRegisterAdjacencyCacheFunctions(sqlite3 *db) {
+    /* Connections may register concurrently; create the cache mutex once */
+    sqlite3_mutex *pMaster = sqlite3_mutex_alloc(SQLITE_MUTEX_STATIC_MASTER);
+    sqlite3_mutex_enter(pMaster);
+    if (!g_adjCache.mutex) g_adjCache.mutex = sqlite3_mutex_alloc(SQLITE_MUTEX_FAST);
+    sqlite3_mutex_leave(pMaster);
+
+    return sqlite3_create_function(db, "graph_cache_stats", 0,
+                                   SQLITE_UTF8, NULL,
+                                   adjCacheStatsFunc, NULL, NULL);
+}
@@ -425,15 +425,24 @@ CompositeIndex* graphCreateCompositeIndex(GraphVtab *pGraph,
 }
 
 /*
-** Convert graph to Compressed Sparse Row format
+** Convert graph to Compressed Sparse Row format.
+**
+** Rows are the nodes in ascending id order; the out-edges of row i are
+** columnIndices[rowOffsets[i] .. rowOffsets[i+1]-1], stored as target row
+** numbers so traversals never go back to SQL. Edges are read in one scan
+** and bucketed by source row with a two-pass counting sort. Edges whose
+** endpoints are not in the nodes table are dropped.
 */
 CSRGraph* graphConvertToCSR(GraphVtab *pGraph) {
     if (!pGraph) return NULL;
     
     CSRGraph *csr = sqlite3_malloc(sizeof(CSRGraph));
     if (!csr) return NULL;
+    memset(csr, 0, sizeof(CSRGraph));
     
-    int nNodes = 0, nEdges = 0;
+    sqlite3_int64 nNodes = 0, nEdges = 0, nRead = 0;
+    sqlite3_int64 *aFrom = NULL, *aTo = NULL;
+    double *aWeight = NULL;
     char *zSql;
     sqlite3_stmt *pStmt;
     int rc;
@@ -442,7 +451,7 @@ CSRGraph* graphConvertToCSR(GraphVtab *pGraph) {
     rc = sqlite3_prepare_v2(pGraph->pDb, zSql, -1, &pStmt, 0);
     sqlite3_free(zSql);
     if( rc==SQLITE_OK && sqlite3_step(pStmt)==SQLITE_ROW ){
-      nNodes = sqlite3_column_int(pStmt, 0);
+      nNodes = sqlite3_column_int64(pStmt, 0);
     }
     sqlite3_finalize(pStmt);
 
@@ -450,32 +459,353 @@ CSRGraph* graphConvertToCSR(GraphVtab *pGraph) {
     rc = sqlite3_prepare_v2(pGraph->pDb, zSql, -1, &pStmt, 0);
     sqlite3_free(zSql);
     if( rc==SQLITE_OK && sqlite3_step(pStmt)==SQLITE_ROW ){
-      nEdges = sqlite3_column_int(pStmt, 0);
+      nEdges = sqlite3_column_int64(pStmt, 0);
     }
     sqlite3_finalize(pStmt);
 
-    csr->nNodes = nNodes;
-    csr->nEdges = nEdges;
-    
     /* Allocate arrays */
-    csr->rowOffsets = sqlite3_malloc((csr->nNodes + 1) * sizeof(sqlite3_int64));
-    csr->columnIndices = sqlite3_malloc(csr->nEdges * sizeof(sqlite3_int64));
-    csr->edgeWeights = sqlite3_malloc(csr->nEdges * sizeof(double));
-    
-    if (!csr->rowOffsets || !csr->columnIndices || !csr->edgeWeights) {
-        sqlite3_free(csr->rowOffsets);
-        sqlite3_free(csr->columnIndices);
-        sqlite3_free(csr->edgeWeights);
-        sqlite3_free(csr);
-        return NULL;
+    csr->nodeIds = sqlite3_malloc64((nNodes + 1) * sizeof(sqlite3_int64));
+    csr->rowOffsets = sqlite3_malloc64((nNodes + 1) * sizeof(sqlite3_int64));
+    csr->columnIndices = sqlite3_malloc64((nEdges + 1) * sizeof(sqlite3_int64));
+    csr->edgeWeights = sqlite3_malloc64((nEdges + 1) * sizeof(double));
+    csr->nodeDegrees = sqlite3_malloc64((nNodes + 1) * sizeof(int));
+    aFrom = sqlite3_malloc64((nEdges + 1) * sizeof(sqlite3_int64));
+    aTo = sqlite3_malloc64((nEdges + 1) * sizeof(sqlite3_int64));
+    aWeight = sqlite3_malloc64((nEdges + 1) * sizeof(double));
+    
+    if (!csr->nodeIds || !csr->rowOffsets || !csr->columnIndices ||
+        !csr->edgeWeights || !csr->nodeDegrees || !aFrom || !aTo || !aWeight) {
+        goto csr_error;
     }
     
-    /* Build CSR representation */
-    /* Convert adjacency list to Compressed Sparse Row format */
-    /* CSR is efficient for graph algorithms but requires full implementation */
-    /* For Phase 1/2, return basic structure */
-    /* nNodes and nEdges already set above */
-    /* Initialize pointers - full implementation would populate these */
+    /* Row numbers follow node id order so ids can be found by bisection */
+    zSql = sqlite3_mprintf("SELECT id FROM %s_nodes ORDER BY id", pGraph->zTableName);
+    rc = sqlite3_prepare_v2(pGraph->pDb, zSql, -1, &pStmt, 0);
+    sqlite3_free(zSql);
+    if( rc!=SQLITE_OK ) goto csr_error;
+    while( csr->nNodes<nNodes && sqlite3_step(pStmt)==SQLITE_ROW ){
+      csr->nodeIds[csr->nNodes++] = sqlite3_column_int64(pStmt, 0);
+    }
+    sqlite3_finalize(pStmt);
     
+    /* Single scan of the edges, translated to row numbers */
+    zSql = sqlite3_mprintf("SELECT from_id, to_id, weight FROM %s_edges", pGraph->zTableName);
+    rc = sqlite3_prepare_v2(pGraph->pDb, zSql, -1, &pStmt, 0);
+    sqlite3_free(zSql);
+    if( rc!=SQLITE_OK ) goto csr_error;
+    while( nRead<nEdges && sqlite3_step(pStmt)==SQLITE_ROW ){
+      sqlite3_int64 iFrom = graphCSRRow(csr, sqlite3_column_int64(pStmt, 0));
+      sqlite3_int64 iTo = graphCSRRow(csr, sqlite3_column_int64(pStmt, 1));
+      if( iFrom<0 || iTo<0 ) continue;
+      aFrom[nRead] = iFrom;
+      aTo[nRead] = iTo;
+      aWeight[nRead] = sqlite3_column_double(pStmt, 2);
+      nRead++;
+    }
+    sqlite3_finalize(pStmt);
+    
+    /* Counting sort by source row: degrees, prefix sums, then placement */
+    memset(csr->rowOffsets, 0, (csr->nNodes + 1) * sizeof(sqlite3_int64));
+    for (sqlite3_int64 i = 0; i < nRead; i++) {
+        csr->rowOffsets[aFrom[i] + 1]++;
+    }
+    for (sqlite3_int64 i = 0; i < csr->nNodes; i++) {
+        csr->rowOffsets[i + 1] += csr->rowOffsets[i];
+    }
+    for (sqlite3_int64 i = 0; i < nRead; i++) {
+        sqlite3_int64 iSlot = csr->rowOffsets[aFrom[i]]++;
+        csr->columnIndices[iSlot] = aTo[i];
+        csr->edgeWeights[iSlot] = aWeight[i];
+    }
+    /* Placement advanced each offset to the next row's start; shift back */
+    for (sqlite3_int64 i = csr->nNodes; i > 0; i--) {
+        csr->rowOffsets[i] = csr->rowOffsets[i - 1];
+    }
+    csr->rowOffsets[0] = 0;
+    csr->nEdges = nRead;
+
+    /* Total degree per row, so degree queries never rescan the edges */
+    for (sqlite3_int64 i = 0; i < csr->nNodes; i++) {
+        csr->nodeDegrees[i] = (int)(csr->rowOffsets[i + 1] - csr->rowOffsets[i]);
+    }
+    for (sqlite3_int64 i = 0; i < nRead; i++) {
+        if (aTo[i] != aFrom[i]) csr->nodeDegrees[aTo[i]]++;
+    }
+    
+    sqlite3_free(aFrom);
+    sqlite3_free(aTo);
+    sqlite3_free(aWeight);
     return csr;
-}
\ No newline at end of file
+
+csr_error:
+    sqlite3_free(aFrom);
+    sqlite3_free(aTo);
+    sqlite3_free(aWeight);
+    graphDestroyCSR(csr);
+    return NULL;
+}
+
+/*
+** Return the CSR row of a node id, or -1 if the node is not in the graph.
+** Rows are in id order unless graphReorderCSR() has installed rowsById.
+*/
+sqlite3_int64 graphCSRRow(const CSRGraph *csr, sqlite3_int64 iNodeId) {
+    sqlite3_int64 lo = 0, hi = csr->nNodes - 1;
+    while (lo <= hi) {
+        sqlite3_int64 mid = lo + (hi - lo) / 2;
+        sqlite3_int64 iRow = csr->rowsById ? csr->rowsById[mid] : mid;
+        if (csr->nodeIds[iRow] == iNodeId) return iRow;
+        if (csr->nodeIds[iRow] < iNodeId) lo = mid + 1;
+        else hi = mid - 1;
+    }
+    return -1;
+}
+
+/*
+** Fill *pHot with the traversal fields of a node. Returns SQLITE_OK, or
+** SQLITE_NOTFOUND if the node is not in the snapshot.
+*/
+int graphCSRNodeHot(const CSRGraph *csr, sqlite3_int64 iNodeId, NodeHot *pHot) {
+    sqlite3_int64 iRow = graphCSRRow(csr, iNodeId);
+    if (iRow < 0) return SQLITE_NOTFOUND;
+    pHot->nodeId = iNodeId;
+    pHot->offset = csr->rowOffsets[iRow];
+    pHot->degree = csr->nodeDegrees[iRow];
+    return SQLITE_OK;
+}
+
+/*
+** Free a CSR graph and its arrays.
+*/
+void graphDestroyCSR(CSRGraph *csr) {
+    if (!csr) return;
+    sqlite3_free(csr->rowOffsets);
+    sqlite3_free(csr->columnIndices);
+    sqlite3_free(csr->edgeWeights);
+    sqlite3_free(csr->nodeIds);
+    sqlite3_free(csr->nodeDegrees);
+    sqlite3_free(csr->rowsById);
+    sqlite3_free(csr);
+}
+
+/*
+** Max-heap entry for graphReorderCSR(). Keys only change by one at a time,
+** so stale entries are left in place and skipped or refreshed when popped.
+*/
+typedef struct GorderEntry {
+    sqlite3_int64 key;
+    sqlite3_int64 row;
+} GorderEntry;
+
+typedef struct GorderHeap {
+    GorderEntry *a;
+    sqlite3_int64 n;
+    sqlite3_int64 nAlloc;
+} GorderHeap;
+
+static int gorderPush(GorderHeap *h, sqlite3_int64 key, sqlite3_int64 row) {
+    sqlite3_int64 i;
+    if (h->n == h->nAlloc) {
+        sqlite3_int64 nNew = h->nAlloc ? h->nAlloc * 2 : 64;
+        GorderEntry *aNew = sqlite3_realloc64(h->a, nNew * sizeof(GorderEntry));
+        if (!aNew) return SQLITE_NOMEM;
+        h->a = aNew;
+        h->nAlloc = nNew;
+    }
+    i = h->n++;
+    while (i > 0 && h->a[(i - 1) / 2].key < key) {
+        h->a[i] = h->a[(i - 1) / 2];
+        i = (i - 1) / 2;
+    }
+    h->a[i].key = key;
+    h->a[i].row = row;
+    return SQLITE_OK;
+}
+
+static GorderEntry gorderPop(GorderHeap *h) {
+    GorderEntry top = h->a[0];
+    GorderEntry last = h->a[--h->n];
+    sqlite3_int64 i = 0;
+    for (;;) {
+        sqlite3_int64 c = 2 * i + 1;
+        if (c >= h->n) break;
+        if (c + 1 < h->n && h->a[c + 1].key > h->a[c].key) c++;
+        if (h->a[c].key <= last.key) break;
+        h->a[i] = h->a[c];
+        i = c;
+    }
+    if (h->n > 0) h->a[i] = last;
+    return top;
+}
+
+/*
+** Adjust the Gorder score of every unplaced row related to row v by delta:
+** its out-neighbors, its in-neighbors, and its siblings (rows sharing an
+** in-neighbor with v). Rows whose score rises are pushed onto the heap.
+*/
+static int gorderScore(const CSRGraph *csr, const sqlite3_int64 *aInOff,
+                       const sqlite3_int64 *aIn, sqlite3_int64 *aKey,
+                       const unsigned char *aPlaced, GorderHeap *h,
+                       sqlite3_int64 v, int delta) {
+    sqlite3_int64 e, f;
+    for (e = csr->rowOffsets[v]; e < csr->rowOffsets[v + 1]; e++) {
+        sqlite3_int64 u = csr->columnIndices[e];
+        if (aPlaced[u]) continue;
+        aKey[u] += delta;
+        if (delta > 0 && gorderPush(h, aKey[u], u)) return SQLITE_NOMEM;
+    }
+    for (e = aInOff[v]; e < aInOff[v + 1]; e++) {
+        sqlite3_int64 w = aIn[e];
+        if (!aPlaced[w]) {
+            aKey[w] += delta;
+            if (delta > 0 && gorderPush(h, aKey[w], w)) return SQLITE_NOMEM;
+        }
+        for (f = csr->rowOffsets[w]; f < csr->rowOffsets[w + 1]; f++) {
+            sqlite3_int64 u = csr->columnIndices[f];
+            if (u == v || aPlaced[u]) continue;
+            aKey[u] += delta;
+            if (delta > 0 && gorderPush(h, aKey[u], u)) return SQLITE_NOMEM;
+        }
+    }
+    return SQLITE_OK;
+}
+
+/*
+** Reorder CSR rows with the Gorder greedy heuristic (Wei et al., SIGMOD
+** 2016): rows are emitted one at a time, each time choosing the unplaced
+** row with the highest score against the last nWindow emitted rows, where
+** the score counts shared in-neighbors plus direct edges. Rows that are
+** traversed together end up adjacent in the arrays, improving cache reuse.
+**
+** Only the snapshot is permuted; node ids are untouched, and rowsById keeps
+** graphCSRRow() working. Returns SQLITE_OK or SQLITE_NOMEM.
+*/
+int graphReorderCSR(CSRGraph *csr, int nWindow) {
+    sqlite3_int64 n = csr->nNodes, m = csr->nEdges;
+    sqlite3_int64 *aInOff = NULL, *aIn = NULL, *aKey = NULL, *aOrder = NULL;
+    sqlite3_int64 *aNewRow = NULL, *aOffsets = NULL, *aColumns = NULL;
+    sqlite3_int64 *aIds = NULL, *aById = NULL;
+    double *aWeights = NULL;
+    int *aDegrees = NULL;
+    unsigned char *aPlaced = NULL;
+    GorderHeap heap = {0, 0, 0};
+    sqlite3_int64 i, e, nOrder = 0, iSeed = 0;
+    int rc = SQLITE_NOMEM;
+
+    if (n < 2) return SQLITE_OK;
+    if (nWindow < 1) nWindow = 1;
+
+    aInOff = sqlite3_malloc64((n + 1) * sizeof(sqlite3_int64));
+    aIn = sqlite3_malloc64((m + 1) * sizeof(sqlite3_int64));
+    aKey = sqlite3_malloc64(n * sizeof(sqlite3_int64));
+    aOrder = sqlite3_malloc64(n * sizeof(sqlite3_int64));
+    aNewRow = sqlite3_malloc64(n * sizeof(sqlite3_int64));
+    aOffsets = sqlite3_malloc64((n + 1) * sizeof(sqlite3_int64));
+    aColumns = sqlite3_malloc64((m + 1) * sizeof(sqlite3_int64));
+    aWeights = sqlite3_malloc64((m + 1) * sizeof(double));
+    aIds = sqlite3_malloc64(n * sizeof(sqlite3_int64));
+    aById = sqlite3_malloc64(n * sizeof(sqlite3_int64));
+    aDegrees = sqlite3_malloc64(n * sizeof(int));
+    aPlaced = sqlite3_malloc64(n);
+    if (!aInOff || !aIn || !aKey || !aOrder || !aNewRow || !aOffsets ||
+        !aColumns || !aWeights || !aIds || !aById || !aDegrees || !aPlaced) {
+        goto reorder_done;
+    }
+
+    /* Reverse adjacency, by the same counting sort as the forward arrays */
+    memset(aInOff, 0, (n + 1) * sizeof(sqlite3_int64));
+    for (e = 0; e < m; e++) aInOff[csr->columnIndices[e] + 1]++;
+    for (i = 0; i < n; i++) aInOff[i + 1] += aInOff[i];
+    for (i = 0; i < n; i++) {
+        for (e = csr->rowOffsets[i]; e < csr->rowOffsets[i + 1]; e++) {
+            aIn[aInOff[csr->columnIndices[e]]++] = i;
+        }
+    }
+    for (i = n; i > 0; i--) aInOff[i] = aInOff[i - 1];
+    aInOff[0] = 0;
+
+    memset(aKey, 0, n * sizeof(sqlite3_int64));
+    memset(aPlaced, 0, n);
+
+    while (nOrder < n) {
+        sqlite3_int64 v = -1;
+
+        /* Highest-scoring unplaced row; fall back to the next unplaced row */
+        while (heap.n > 0) {
+            GorderEntry top = gorderPop(&heap);
+            if (aPlaced[top.row]) continue;
+            if (top.key != aKey[top.row]) {
+                if (gorderPush(&heap, aKey[top.row], top.row)) goto reorder_done;
+                continue;
+            }
+            if (top.key > 0) v = top.row;
+            break;
+        }
+        if (v < 0) {
+            while (aPlaced[iSeed]) iSeed++;
+            v = iSeed;
+        }
+
+        aPlaced[v] = 1;
+        aOrder[nOrder++] = v;
+        if (gorderScore(csr, aInOff, aIn, aKey, aPlaced, &heap, v, 1)) goto reorder_done;
+        if (nOrder > nWindow) {
+            gorderScore(csr, aInOff, aIn, aKey, aPlaced, &heap,
+                        aOrder[nOrder - nWindow - 1], -1);
+        }
+    }
+
+    /* Permute the snapshot into the new row order */
+    for (i = 0; i < n; i++) aNewRow[aOrder[i]] = i;
+    aOffsets[0] = 0;
+    for (i = 0; i < n; i++) {
+        sqlite3_int64 iOld = aOrder[i];
+        sqlite3_int64 nDeg = csr->rowOffsets[iOld + 1] - csr->rowOffsets[iOld];
+        for (e = 0; e < nDeg; e++) {
+            aColumns[aOffsets[i] + e] = aNewRow[csr->columnIndices[csr->rowOffsets[iOld] + e]];
+            aWeights[aOffsets[i] + e] = csr->edgeWeights[csr->rowOffsets[iOld] + e];
+        }
+        aOffsets[i + 1] = aOffsets[i] + nDeg;
+        aIds[i] = csr->nodeIds[iOld];
+        aDegrees[i] = csr->nodeDegrees[iOld];
+    }
+
+    /* rowsById[k] is the row of the k-th smallest node id */
+    for (i = 0; i < n; i++) {
+        sqlite3_int64 iOld = csr->rowsById ? csr->rowsById[i] : i;
+        aById[i] = aNewRow[iOld];
+    }
+
+    sqlite3_free(csr->rowOffsets);
+    sqlite3_free(csr->columnIndices);
+    sqlite3_free(csr->edgeWeights);
+    sqlite3_free(csr->nodeIds);
+    sqlite3_free(csr->nodeDegrees);
+    sqlite3_free(csr->rowsById);
+    csr->rowOffsets = aOffsets;
+    csr->columnIndices = aColumns;
+    csr->edgeWeights = aWeights;
+    csr->nodeIds = aIds;
+    csr->rowsById = aById;
+    csr->nodeDegrees = aDegrees;
+    aOffsets = aColumns = aIds = aById = NULL;
+    aWeights = NULL;
+    aDegrees = NULL;
+    rc = SQLITE_OK;
+
+reorder_done:
+    sqlite3_free(heap.a);
+    sqlite3_free(aInOff);
+    sqlite3_free(aIn);
+    sqlite3_free(aKey);
+    sqlite3_free(aOrder);
+    sqlite3_free(aNewRow);
+    sqlite3_free(aOffsets);
+    sqlite3_free(aColumns);
+    sqlite3_free(aWeights);
+    sqlite3_free(aIds);
+    sqlite3_free(aById);
+    sqlite3_free(aDegrees);
+    sqlite3_free(aPlaced);
+    return rc;
+}
@@ -18,6 +18,8 @@ extern const sqlite3_api_routines *sqlite3_api;
 #include "graph-memory.h"
 #include "graph-vtab.h"
 #include "graph-memory.h"
+#include "graph-performance.h"
+#include "cypher.h"
 #include <string.h>
 #include <stdlib.h>
 
@@ -452,6 +454,590 @@ static int graphDFSRowid(sqlite3_vtab_cursor *pCursor, sqlite3_int64 *pRowid){
   return SQLITE_OK;
 }
 
+/*
+** graph_degree_centrality_all([min_id [, max_id]])
+**
+** Eponymous table-valued function returning (node_id, centrality) for every
+** node, or for the nodes whose ids fall in [min_id, max_id], ordered by id.
+** Centrality matches graph_degree_centrality(): edges touching the node
+** divided by (n-1). All degrees are computed in one pass, from the CSR
+** snapshot when one is current and from a single edge-table scan otherwise.
+*/
+typedef struct GraphCentralityCursor GraphCentralityCursor;
+struct GraphCentralityCursor {
+  sqlite3_vtab_cursor base;  /* Base class - must be first */
+  sqlite3_int64 *aNodeIds;   /* Node ids, ascending */
+  double *aCentrality;       /* Centrality of aNodeIds[i] */
+  int nRows;                 /* Number of result rows */
+  int iRow;                  /* Current row */
+};
+
+#define CENTRALITY_COL_MIN_ID 2
+#define CENTRALITY_COL_MAX_ID 3
+#define CENTRALITY_ID_LOWEST  (-0x7fffffffffffffffLL - 1)
+#define CENTRALITY_ID_HIGHEST 0x7fffffffffffffffLL
+
+static int graphCentralityConnect(sqlite3 *pDb, void *pAux, int argc,
+                                 const char *const *argv,
+                                 sqlite3_vtab **ppVtab, char **pzErr){
+  sqlite3_vtab *pNew;
+  int rc;
+
+  UNUSED(pAux);
+  UNUSED(argc);
+  UNUSED(argv);
+  UNUSED(pzErr);
+
+  rc = sqlite3_declare_vtab(pDb, "CREATE TABLE x("
+                                "node_id INTEGER,"
+                                "centrality REAL,"
+                                "min_id HIDDEN,"
+                                "max_id HIDDEN"
+                                ")");
+  if( rc!=SQLITE_OK ){
+    return rc;
+  }
+  pNew = sqlite3_malloc(sizeof(*pNew));
+  if( pNew==0 ){
+    return SQLITE_NOMEM;
+  }
+  memset(pNew, 0, sizeof(*pNew));
+  *ppVtab = pNew;
+  return SQLITE_OK;
+}
+
+/*
+** idxNum bit 1: min_id supplied, bit 2: max_id supplied.
+*/
+static int graphCentralityBestIndex(sqlite3_vtab *pVtab,
+                                   sqlite3_index_info *pInfo){
+  int iMinArg = -1;
+  int iMaxArg = -1;
+  int nArg = 0;
+  int i;
+
+  UNUSED(pVtab);
+
+  for( i=0; i<pInfo->nConstraint; i++ ){
+    const struct sqlite3_index_constraint *p = &pInfo->aConstraint[i];
+    if( p->op!=SQLITE_INDEX_CONSTRAINT_EQ ) continue;
+    if( !p->usable ) return SQLITE_CONSTRAINT;
+    if( p->iColumn==CENTRALITY_COL_MIN_ID ) iMinArg = i;
+    if( p->iColumn==CENTRALITY_COL_MAX_ID ) iMaxArg = i;
+  }
+
+  pInfo->idxNum = 0;
+  if( iMinArg>=0 ){
+    pInfo->aConstraintUsage[iMinArg].argvIndex = ++nArg;
+    pInfo->aConstraintUsage[iMinArg].omit = 1;
+    pInfo->idxNum |= 1;
+  }
+  if( iMaxArg>=0 ){
+    pInfo->aConstraintUsage[iMaxArg].argvIndex = ++nArg;
+    pInfo->aConstraintUsage[iMaxArg].omit = 1;
+    pInfo->idxNum |= 2;
+  }
+
+  /* Rows come out in node id order */
+  if( pInfo->nOrderBy==1 && pInfo->aOrderBy[0].iColumn==0
+   && !pInfo->aOrderBy[0].desc ){
+    pInfo->orderByConsumed = 1;
+  }
+
+  pInfo->estimatedCost = 1000.0;
+  pInfo->estimatedRows = 1000;
+  return SQLITE_OK;
+}
+
+static int graphCentralityDisconnect(sqlite3_vtab *pVtab){
+  sqlite3_free(pVtab);
+  return SQLITE_OK;
+}
+
+static int graphCentralityOpen(sqlite3_vtab *pVtab,
+                              sqlite3_vtab_cursor **ppCursor){
+  GraphCentralityCursor *pCur;
+
+  UNUSED(pVtab);
+
+  pCur = sqlite3_malloc(sizeof(*pCur));
+  if( pCur==0 ){
+    return SQLITE_NOMEM;
+  }
+  memset(pCur, 0, sizeof(*pCur));
+  *ppCursor = &pCur->base;
+  return SQLITE_OK;
+}
+
+static void graphCentralityReset(GraphCentralityCursor *pCur){
+  sqlite3_free(pCur->aNodeIds);
+  sqlite3_free(pCur->aCentrality);
+  pCur->aNodeIds = 0;
+  pCur->aCentrality = 0;
+  pCur->nRows = 0;
+  pCur->iRow = 0;
+}
+
+static int graphCentralityClose(sqlite3_vtab_cursor *pCursor){
+  GraphCentralityCursor *pCur = (GraphCentralityCursor*)pCursor;
+  graphCentralityReset(pCur);
+  sqlite3_free(pCur);
+  return SQLITE_OK;
+}
+
+/*
+** Fill the cursor from a current CSR snapshot, reading the precomputed
+** per-row degrees rather than walking the edge arrays.
+*/
+static int graphCentralityFromCSR(GraphCentralityCursor *pCur,
+                                 const CSRGraph *pG,
+                                 sqlite3_int64 iMin, sqlite3_int64 iMax){
+  sqlite3_int64 i;
+  double rScale = pG->nNodes>1 ? 1.0 / (double)(pG->nNodes - 1) : 0.0;
+
+  pCur->aNodeIds = sqlite3_malloc64((pG->nNodes + 1) * sizeof(sqlite3_int64));
+  pCur->aCentrality = sqlite3_malloc64((pG->nNodes + 1) * sizeof(double));
+  if( pCur->aNodeIds==0 || pCur->aCentrality==0 ){
+    return SQLITE_NOMEM;
+  }
+
+  for( i=0; i<pG->nNodes; i++ ){
+    sqlite3_int64 iRow = pG->rowsById ? pG->rowsById[i] : i;
+    sqlite3_int64 iNodeId = pG->nodeIds[iRow];
+    if( iNodeId<iMin || iNodeId>iMax ) continue;
+    pCur->aNodeIds[pCur->nRows] = iNodeId;
+    pCur->aCentrality[pCur->nRows] = pG->nodeDegrees[iRow] * rScale;
+    pCur->nRows++;
+  }
+
+  return SQLITE_OK;
+}
+
+/*
+** Fill the cursor with one query: node degrees come from a single grouped
+** scan of the edge table joined back to the nodes in range.
+*/
+static int graphCentralityFromSQL(GraphCentralityCursor *pCur,
+                                 GraphVtab *pG,
+                                 sqlite3_int64 iMin, sqlite3_int64 iMax){
+  sqlite3_stmt *pStmt;
+  char *zSql;
+  sqlite3_int64 nNodes = 0;
+  int nAlloc = 0;
+  double rScale;
+  int rc;
+
+  zSql = sqlite3_mprintf("SELECT count(*) FROM %s_nodes", pG->zTableName);
+  if( zSql==0 ) return SQLITE_NOMEM;
+  rc = sqlite3_prepare_v2(pG->pDb, zSql, -1, &pStmt, 0);
+  sqlite3_free(zSql);
+  if( rc!=SQLITE_OK ) return rc;
+  if( sqlite3_step(pStmt)==SQLITE_ROW ){
+    nNodes = sqlite3_column_int64(pStmt, 0);
+  }
+  sqlite3_finalize(pStmt);
+  rScale = nNodes>1 ? 1.0 / (double)(nNodes - 1) : 0.0;
+
+  zSql = sqlite3_mprintf(
+      "SELECT n.id, ifnull(d.degree, 0) FROM %s_nodes n LEFT JOIN ("
+      "SELECT id, count(*) AS degree FROM ("
+      "SELECT from_id AS id FROM %s_edges UNION ALL "
+      "SELECT to_id FROM %s_edges WHERE to_id<>from_id) GROUP BY id"
+      ") d ON d.id=n.id WHERE n.id BETWEEN ?1 AND ?2 ORDER BY n.id",
+      pG->zTableName, pG->zTableName, pG->zTableName);
+  if( zSql==0 ) return SQLITE_NOMEM;
+  rc = sqlite3_prepare_v2(pG->pDb, zSql, -1, &pStmt, 0);
+  sqlite3_free(zSql);
+  if( rc!=SQLITE_OK ) return rc;
+  sqlite3_bind_int64(pStmt, 1, iMin);
+  sqlite3_bind_int64(pStmt, 2, iMax);
+
+  while( (rc = sqlite3_step(pStmt))==SQLITE_ROW ){
+    if( pCur->nRows>=nAlloc ){
+      int nNew = nAlloc ? nAlloc*2 : 64;
+      sqlite3_int64 *aIds = sqlite3_realloc64(pCur->aNodeIds,
+                                              nNew * sizeof(sqlite3_int64));
+      double *aVals;
+      if( aIds==0 ){
+        sqlite3_finalize(pStmt);
+        return SQLITE_NOMEM;
+      }
+      pCur->aNodeIds = aIds;
+      aVals = sqlite3_realloc64(pCur->aCentrality, nNew * sizeof(double));
+      if( aVals==0 ){
+        sqlite3_finalize(pStmt);
+        return SQLITE_NOMEM;
+      }
+      pCur->aCentrality = aVals;
+      nAlloc = nNew;
+    }
+    pCur->aNodeIds[pCur->nRows] = sqlite3_column_int64(pStmt, 0);
+    pCur->aCentrality[pCur->nRows] = sqlite3_column_int64(pStmt, 1) * rScale;
+    pCur->nRows++;
+  }
+  sqlite3_finalize(pStmt);
+  return rc==SQLITE_DONE ? SQLITE_OK : rc;
+}
+
+static int graphCentralityFilter(sqlite3_vtab_cursor *pCursor, int idxNum,
+                                const char *idxStr, int argc,
+                                sqlite3_value **argv){
+  GraphCentralityCursor *pCur = (GraphCentralityCursor*)pCursor;
+  sqlite3_int64 iMin = CENTRALITY_ID_LOWEST;
+  sqlite3_int64 iMax = CENTRALITY_ID_HIGHEST;
+  GraphVtab *pG = getGlobalGraph();
+  CSRGraph *pCsr;
+  int iArg = 0;
+  int rc;
+
+  UNUSED(idxStr);
+  UNUSED(argc);
+
+  graphCentralityReset(pCur);
+
+  if( idxNum & 1 ) iMin = sqlite3_value_int64(argv[iArg++]);
+  if( idxNum & 2 ) iMax = sqlite3_value_int64(argv[iArg++]);
+
+  if( pG==0 ){
+    sqlite3_free(pCursor->pVtab->zErrMsg);
+    pCursor->pVtab->zErrMsg = sqlite3_mprintf("No graph table available. Create a graph table first using: CREATE VIRTUAL TABLE mygraph USING graph();");
+    return SQLITE_ERROR;
+  }
+
+  pCsr = graphCurrentCSR();
+  if( pCsr ){
+    rc = graphCentralityFromCSR(pCur, pCsr, iMin, iMax);
+  }else{
+    rc = graphCentralityFromSQL(pCur, pG, iMin, iMax);
+  }
+  if( rc!=SQLITE_OK ){
+    graphCentralityReset(pCur);
+  }
+  return rc;
+}
+
+static int graphCentralityNext(sqlite3_vtab_cursor *pCursor){
+  GraphCentralityCursor *pCur = (GraphCentralityCursor*)pCursor;
+  pCur->iRow++;
+  return SQLITE_OK;
+}
+
+static int graphCentralityEof(sqlite3_vtab_cursor *pCursor){
+  GraphCentralityCursor *pCur = (GraphCentralityCursor*)pCursor;
+  return pCur->iRow >= pCur->nRows;
+}
+
+static int graphCentralityColumn(sqlite3_vtab_cursor *pCursor,
+                                sqlite3_context *pCtx, int iCol){
+  GraphCentralityCursor *pCur = (GraphCentralityCursor*)pCursor;
+
+  switch( iCol ){
+    case 0:  /* node_id */
+      sqlite3_result_int64(pCtx, pCur->aNodeIds[pCur->iRow]);
+      break;
+    case 1:  /* centrality */
+      sqlite3_result_double(pCtx, pCur->aCentrality[pCur->iRow]);
+      break;
+    default:  /* hidden arguments */
+      sqlite3_result_null(pCtx);
+      break;
+  }
+  return SQLITE_OK;
+}
+
+static int graphCentralityRowid(sqlite3_vtab_cursor *pCursor,
+                               sqlite3_int64 *pRowid){
+  GraphCentralityCursor *pCur = (GraphCentralityCursor*)pCursor;
+  *pRowid = pCur->aNodeIds[pCur->iRow];
+  return SQLITE_OK;
+}
+
+/*
+** Eponymous-only module: xCreate is 0, so it is used as a function call
+** in FROM and cannot be instantiated with CREATE VIRTUAL TABLE.
+*/
+static sqlite3_module graphCentralityModule = {
+  0,                           /* iVersion */
+  0,                           /* xCreate */
+  graphCentralityConnect,      /* xConnect */
+  graphCentralityBestIndex,    /* xBestIndex */
+  graphCentralityDisconnect,   /* xDisconnect */
+  0,                           /* xDestroy */
+  graphCentralityOpen,         /* xOpen */
+  graphCentralityClose,        /* xClose */
+  graphCentralityFilter,       /* xFilter */
+  graphCentralityNext,         /* xNext */
+  graphCentralityEof,          /* xEof */
+  graphCentralityColumn,       /* xColumn */
+  graphCentralityRowid,        /* xRowid */
+  0,                           /* xUpdate */
+  0,                           /* xBegin */
+  0,                           /* xSync */
+  0,                           /* xCommit */
+  0,                           /* xRollback */
+  0,                           /* xFindFunction */
+  0,                           /* xRename */
+  0,                           /* xSavepoint */
+  0,                           /* xRelease */
+  0,                           /* xRollbackTo */
+  0,                           /* xShadowName */
+  0                            /* xIntegrity */
+};
+
+/*
+** cypher_validate_many(queries)
+**
+** Eponymous table-valued function taking a JSON array of Cypher query
+** strings and returning one (query, valid, error) row per element, so a
+** batch of queries is checked in one statement instead of one
+** cypher_validate() call each. The array is walked lazily with json_each()
+** and every query goes through the same parse cache as cypher_validate().
+*/
+typedef struct CypherValidateVtab CypherValidateVtab;
+struct CypherValidateVtab {
+  sqlite3_vtab base;         /* Base class - must be first */
+  sqlite3 *pDb;              /* Connection used to run json_each() */
+};
+
+typedef struct CypherValidateCursor CypherValidateCursor;
+struct CypherValidateCursor {
+  sqlite3_vtab_cursor base;  /* Base class - must be first */
+  sqlite3_stmt *pStmt;       /* SELECT value FROM json_each(?) */
+  int bEof;                  /* No more rows */
+  int bValid;                /* Current query parses */
+  char *zError;              /* Parse error of current query, or NULL */
+  sqlite3_int64 iRow;        /* Index of current element */
+};
+
+#define VALIDATE_COL_QUERIES 3
+
+static int cypherValidateConnect(sqlite3 *pDb, void *pAux, int argc,
+                                const char *const *argv,
+                                sqlite3_vtab **ppVtab, char **pzErr){
+  CypherValidateVtab *pNew;
+  int rc;
+
+  UNUSED(pAux);
+  UNUSED(argc);
+  UNUSED(argv);
+  UNUSED(pzErr);
+
+  rc = sqlite3_declare_vtab(pDb, "CREATE TABLE x("
+                                "query TEXT,"
+                                "valid INTEGER,"
+                                "error TEXT,"
+                                "queries HIDDEN"
+                                ")");
+  if( rc!=SQLITE_OK ){
+    return rc;
+  }
+  pNew = sqlite3_malloc(sizeof(*pNew));
+  if( pNew==0 ){
+    return SQLITE_NOMEM;
+  }
+  memset(pNew, 0, sizeof(*pNew));
+  pNew->pDb = pDb;
+  *ppVtab = &pNew->base;
+  return SQLITE_OK;
+}
+
+/*
+** idxNum 1: the queries argument was supplied. Without it there are no rows.
+*/
+static int cypherValidateBestIndex(sqlite3_vtab *pVtab,
+                                  sqlite3_index_info *pInfo){
+  int i;
+
+  UNUSED(pVtab);
+
+  pInfo->idxNum = 0;
+  for( i=0; i<pInfo->nConstraint; i++ ){
+    const struct sqlite3_index_constraint *p = &pInfo->aConstraint[i];
+    if( p->op!=SQLITE_INDEX_CONSTRAINT_EQ ) continue;
+    if( p->iColumn!=VALIDATE_COL_QUERIES ) continue;
+    if( !p->usable ) return SQLITE_CONSTRAINT;
+    pInfo->aConstraintUsage[i].argvIndex = 1;
+    pInfo->aConstraintUsage[i].omit = 1;
+    pInfo->idxNum = 1;
+    break;
+  }
+
+  pInfo->estimatedCost = 100.0;
+  pInfo->estimatedRows = 100;
+  return SQLITE_OK;
+}
+
+static int cypherValidateDisconnect(sqlite3_vtab *pVtab){
+  sqlite3_free(pVtab);
+  return SQLITE_OK;
+}
+
+static int cypherValidateOpen(sqlite3_vtab *pVtab,
+                             sqlite3_vtab_cursor **ppCursor){
+  CypherValidateCursor *pCur;
+
+  UNUSED(pVtab);
+
+  pCur = sqlite3_malloc(sizeof(*pCur));
+  if( pCur==0 ){
+    return SQLITE_NOMEM;
+  }
+  memset(pCur, 0, sizeof(*pCur));
+  pCur->bEof = 1;
+  *ppCursor = &pCur->base;
+  return SQLITE_OK;
+}
+
+static void cypherValidateReset(CypherValidateCursor *pCur){
+  sqlite3_finalize(pCur->pStmt);
+  sqlite3_free(pCur->zError);
+  pCur->pStmt = 0;
+  pCur->zError = 0;
+  pCur->bEof = 1;
+  pCur->iRow = 0;
+}
+
+static int cypherValidateClose(sqlite3_vtab_cursor *pCursor){
+  CypherValidateCursor *pCur = (CypherValidateCursor*)pCursor;
+  cypherValidateReset(pCur);
+  sqlite3_free(pCur);
+  return SQLITE_OK;
+}
+
+/*
+** Step to the next array element and validate it.
+*/
+static int cypherValidateStep(CypherValidateCursor *pCur){
+  const char *zQuery;
+  char *zError = 0;
+  int rc;
+
+  sqlite3_free(pCur->zError);
+  pCur->zError = 0;
+
+  rc = sqlite3_step(pCur->pStmt);
+  if( rc==SQLITE_DONE ){
+    pCur->bEof = 1;
+    return SQLITE_OK;
+  }
+  if( rc!=SQLITE_ROW ){
+    pCur->bEof = 1;
+    return rc;
+  }
+
+  zQuery = (const char*)sqlite3_column_text(pCur->pStmt, 0);
+  if( zQuery==0 ){
+    pCur->bValid = 0;
+    pCur->zError = sqlite3_mprintf("Invalid query parameter");
+    return pCur->zError ? SQLITE_OK : SQLITE_NOMEM;
+  }
+  pCur->bValid = cypherValidateCached(zQuery, &zError);
+  if( pCur->bValid<0 ){
+    return SQLITE_NOMEM;
+  }
+  if( !pCur->bValid ){
+    pCur->zError = zError ? zError : sqlite3_mprintf("Parse error");
+    if( pCur->zError==0 ) return SQLITE_NOMEM;
+  }
+  return SQLITE_OK;
+}
+
+static int cypherValidateFilter(sqlite3_vtab_cursor *pCursor, int idxNum,
+                               const char *idxStr, int argc,
+                               sqlite3_value **argv){
+  CypherValidateCursor *pCur = (CypherValidateCursor*)pCursor;
+  CypherValidateVtab *pTab = (CypherValidateVtab*)pCursor->pVtab;
+  int rc;
+
+  UNUSED(idxStr);
+  UNUSED(argc);
+
+  cypherValidateReset(pCur);
+  if( idxNum==0 ){
+    return SQLITE_OK;
+  }
+
+  rc = sqlite3_prepare_v2(pTab->pDb, "SELECT value FROM json_each(?1)", -1,
+                          &pCur->pStmt, 0);
+  if( rc!=SQLITE_OK ){
+    return rc;
+  }
+  sqlite3_bind_value(pCur->pStmt, 1, argv[0]);
+  pCur->bEof = 0;
+  return cypherValidateStep(pCur);
+}
+
+static int cypherValidateNext(sqlite3_vtab_cursor *pCursor){
+  CypherValidateCursor *pCur = (CypherValidateCursor*)pCursor;
+  pCur->iRow++;
+  return cypherValidateStep(pCur);
+}
+
+static int cypherValidateEof(sqlite3_vtab_cursor *pCursor){
+  CypherValidateCursor *pCur = (CypherValidateCursor*)pCursor;
+  return pCur->bEof;
+}
+
+static int cypherValidateColumn(sqlite3_vtab_cursor *pCursor,
+                               sqlite3_context *pCtx, int iCol){
+  CypherValidateCursor *pCur = (CypherValidateCursor*)pCursor;
+
+  switch( iCol ){
+    case 0:  /* query */
+      sqlite3_result_value(pCtx, sqlite3_column_value(pCur->pStmt, 0));
+      break;
+    case 1:  /* valid */
+      sqlite3_result_int(pCtx, pCur->bValid);
+      break;
+    case 2:  /* error */
+      if( pCur->zError ){
+        sqlite3_result_text(pCtx, pCur->zError, -1, SQLITE_TRANSIENT);
+      }else{
+        sqlite3_result_null(pCtx);
+      }
+      break;
+    default:  /* hidden argument */
+      sqlite3_result_null(pCtx);
+      break;
+  }
+  return SQLITE_OK;
+}
+
+static int cypherValidateRowid(sqlite3_vtab_cursor *pCursor,
+                              sqlite3_int64 *pRowid){
+  CypherValidateCursor *pCur = (CypherValidateCursor*)pCursor;
+  *pRowid = pCur->iRow;
+  return SQLITE_OK;
+}
+
+static sqlite3_module cypherValidateModule = {
+  0,                           /* iVersion */
+  0,                           /* xCreate */
+  cypherValidateConnect,       /* xConnect */
+  cypherValidateBestIndex,     /* xBestIndex */
+  cypherValidateDisconnect,    /* xDisconnect */
+  0,                           /* xDestroy */
+  cypherValidateOpen,          /* xOpen */
+  cypherValidateClose,         /* xClose */
+  cypherValidateFilter,        /* xFilter */
+  cypherValidateNext,          /* xNext */
+  cypherValidateEof,           /* xEof */
+  cypherValidateColumn,        /* xColumn */
+  cypherValidateRowid,         /* xRowid */
+  0,                           /* xUpdate */
+  0,                           /* xBegin */
+  0,                           /* xSync */
+  0,                           /* xCommit */
+  0,                           /* xRollback */
+  0,                           /* xFindFunction */
+  0,                           /* xRename */
+  0,                           /* xSavepoint */
+  0,                           /* xRelease */
+  0,                           /* xRollbackTo */
+  0,                           /* xShadowName */
+  0                            /* xIntegrity */
+};
+
 /*
 ** Register table-valued functions with SQLite.
 ** Called from main extension init function.
@@ -471,5 +1057,19 @@ int graphRegisterTVF(sqlite3 *pDb){
     return rc;
   }
   
+  /* Register graph_degree_centrality_all() table-valued function */
+  rc = sqlite3_create_module(pDb, "graph_degree_centrality_all",
+                             &graphCentralityModule, 0);
+  if( rc!=SQLITE_OK ){
+    return rc;
+  }
+  
+  /* Register cypher_validate_many() table-valued function */
+  rc = sqlite3_create_module(pDb, "cypher_validate_many",
+                             &cypherValidateModule, 0);
+  if( rc!=SQLITE_OK ){
+    return rc;
+  }
+  
   return SQLITE_OK;
 }
\ No newline at end of file
@@ -20,6 +20,7 @@ SQLITE_EXTENSION_INIT1
 #include "graph-memory.h"
 #include "cypher-planner.h"
 #include "cypher-executor.h"
+#include "graph-performance.h"
 #include <string.h>
 #include <stdio.h> // Added for fprintf
 
@@ -46,15 +47,76 @@ void setGlobalGraph(GraphVtab *pNewGraph) {
   pGraph = pNewGraph;
 }
 
+/*
+** Version stamp of the data behind pVtab, as seen by its connection. It
+** changes when the connection itself writes (sqlite3_total_changes()) and
+** when another connection commits to the database (PRAGMA data_version).
+** Neither counter moves on ROLLBACK; graphRollbackHook() covers that.
+*/
+sqlite3_int64 graphDataVersion(GraphVtab *pVtab){
+  sqlite3_int64 iDataVersion = 0;
+  sqlite3_stmt *pStmt;
+  char *zSql;
+
+  zSql = sqlite3_mprintf("PRAGMA \"%w\".data_version",
+                         pVtab->zDbName ? pVtab->zDbName : "main");
+  if( zSql && sqlite3_prepare_v2(pVtab->pDb, zSql, -1, &pStmt, 0)==SQLITE_OK ){
+    if( sqlite3_step(pStmt)==SQLITE_ROW ){
+      iDataVersion = sqlite3_column_int64(pStmt, 0);
+    }
+    sqlite3_finalize(pStmt);
+  }
+  sqlite3_free(zSql);
+  return (iDataVersion<<32) + (unsigned int)sqlite3_total_changes(pVtab->pDb);
+}
+
+/*
+** CSR snapshot built by graph_build_csr(). It is only trusted while the
+** graph it was built from is still current and graphDataVersion() is
+** unchanged; otherwise callers fall back to querying the edge table.
+** A rollback retires the snapshot, and one built inside a transaction is
+** never trusted, since ROLLBACK TO a savepoint invokes no hook.
+*/
+static CSRGraph *pCsr = 0;
+static GraphVtab *pCsrGraph = 0;
+static sqlite3_int64 iCsrVersion = 0;
+
+CSRGraph *graphCurrentCSR(void){
+  if( pCsr==0 || pGraph==0 || pCsrGraph!=pGraph ) return 0;
+  if( graphDataVersion(pGraph)!=iCsrVersion ) return 0;
+  return pCsr;
+}
+
+/*
+** Rollback hook installed on every connection that loads the extension.
+** Rolled-back writes do not show up in graphDataVersion(), so anything
+** derived from the graph is dropped here.
+*/
+static void graphRollbackHook(void *pArg){
+  (void)pArg;
+  pCsrGraph = 0;
+  graphAdjCacheReset();
+}
+
+#ifdef __GNUC__
+# define GRAPH_PREFETCH(p) __builtin_prefetch(p)
+#else
+# define GRAPH_PREFETCH(p)
+#endif
+
 /*
 ** Forward declarations for SQL functions.
 ** These will be implemented as the extension develops.
 */
 static void graphNodeAddFunc(sqlite3_context*, int, sqlite3_value**);
 static void graphEdgeAddFunc(sqlite3_context*, int, sqlite3_value**);
+static void graphBulkNodeAddFunc(sqlite3_context*, int, sqlite3_value**);
+static void graphBulkEdgeAddRawFunc(sqlite3_context*, int, sqlite3_value**);
 static void graphCountNodesFunc(sqlite3_context*, int, sqlite3_value**);
 static void graphCountEdgesFunc(sqlite3_context*, int, sqlite3_value**);
 static void graphShortestPathFunc(sqlite3_context*, int, sqlite3_value**);
+static void graphBuildCsrFunc(sqlite3_context*, int, sqlite3_value**);
+static void graphReorderGorderFunc(sqlite3_context*, int, sqlite3_value**);
 static void graphPageRankFunc(sqlite3_context*, int, sqlite3_value**);
 static void graphDegreeCentralityFunc(sqlite3_context*, int, sqlite3_value**);
 static void graphIsConnectedFunc(sqlite3_context*, int, sqlite3_value**);
@@ -98,6 +160,9 @@ int sqlite3_graph_init(
   
   /* No mutex initialization needed for simplified approach */
   
+  /* Retire cached graph data when a transaction is rolled back */
+  sqlite3_rollback_hook(pDb, graphRollbackHook, 0);
+  
   /* Register the graph virtual table module */
   rc = sqlite3_create_module(pDb, "graph", &graphModule, (void *)&pGraph);
   if( rc!=SQLITE_OK ){
@@ -123,6 +188,30 @@ int sqlite3_graph_init(
     return rc;
   }
   
+  rc = sqlite3_create_function(pDb, "graph_edge_add", 5, SQLITE_UTF8, 0,
+                              graphEdgeAddFunc, 0, 0);
+  if( rc!=SQLITE_OK ){
+    *pzErrMsg = sqlite3_mprintf("Failed to register graph_edge_add: %s",
+                                sqlite3_errmsg(pDb));
+    return rc;
+  }
+  
+  rc = sqlite3_create_function(pDb, "graph_bulk_node_add", 1, SQLITE_UTF8, 0,
+                              graphBulkNodeAddFunc, 0, 0);
+  if( rc!=SQLITE_OK ){
+    *pzErrMsg = sqlite3_mprintf("Failed to register graph_bulk_node_add: %s",
+                                sqlite3_errmsg(pDb));
+    return rc;
+  }
+  
+  rc = sqlite3_create_function(pDb, "graph_bulk_edge_add_raw", 2, SQLITE_UTF8, 0,
+                              graphBulkEdgeAddRawFunc, 0, 0);
+  if( rc!=SQLITE_OK ){
+    *pzErrMsg = sqlite3_mprintf("Failed to register graph_bulk_edge_add_raw: %s",
+                                sqlite3_errmsg(pDb));
+    return rc;
+  }
+  
   rc = sqlite3_create_function(pDb, "graph_count_nodes", 0, SQLITE_UTF8, 0,
                               graphCountNodesFunc, 0, 0);
   if( rc!=SQLITE_OK ){
@@ -147,6 +236,20 @@ int sqlite3_graph_init(
     return rc;
   }
   
+  rc = graphRegisterAdjacencyCacheFunctions(pDb);
+  if( rc!=SQLITE_OK ){
+    *pzErrMsg = sqlite3_mprintf("Failed to register graph_cache_stats: %s",
+                                sqlite3_errmsg(pDb));
+    return rc;
+  }
+  
+  rc = graphRegisterBenchmarkFunctions(pDb);
+  if( rc!=SQLITE_OK ){
+    *pzErrMsg = sqlite3_mprintf("Failed to register benchmark functions: %s",
+                                sqlite3_errmsg(pDb));
+    return rc;
+  }
+  
   /* Register algorithm functions */
   rc = sqlite3_create_function(pDb, "graph_shortest_path", 2, SQLITE_UTF8, 0,
                               graphShortestPathFunc, 0, 0);
@@ -156,6 +259,22 @@ int sqlite3_graph_init(
     return rc;
   }
   
+  rc = sqlite3_create_function(pDb, "graph_build_csr", 0, SQLITE_UTF8, 0,
+                              graphBuildCsrFunc, 0, 0);
+  if( rc!=SQLITE_OK ){
+    *pzErrMsg = sqlite3_mprintf("Failed to register graph_build_csr: %s",
+                                sqlite3_errmsg(pDb));
+    return rc;
+  }
+  
+  rc = sqlite3_create_function(pDb, "graph_reorder_gorder", -1, SQLITE_UTF8, 0,
+                              graphReorderGorderFunc, 0, 0);
+  if( rc!=SQLITE_OK ){
+    *pzErrMsg = sqlite3_mprintf("Failed to register graph_reorder_gorder: %s",
+                                sqlite3_errmsg(pDb));
+    return rc;
+  }
+  
   rc = sqlite3_create_function(pDb, "graph_pagerank", -1, SQLITE_UTF8, 0,
                               graphPageRankFunc, 0, 0);
   if( rc!=SQLITE_OK ){
@@ -364,15 +483,20 @@ sqlite3_result_error(pCtx, "No graph table available. Create a graph table first
 }
 
 /*
-** SQL function: graph_edge_add(from_id, to_id, weight, properties)
-** Adds an edge to the default graph virtual table.
+** SQL function: graph_edge_add(from_id, to_id, weight, properties [, bidirectional])
+** Adds an edge to the default graph virtual table. When bidirectional is
+** non-zero the reverse edge is added by the same INSERT, so symmetric
+** relationships cost one call; the rowid of the reverse edge is returned.
 ** Usage: SELECT graph_edge_add(1, 2, 1.0, '{"type": "friend"}');
+**        SELECT graph_edge_add(1, 2, 1.0, '{"type": "friend"}', 1);
 */
 static void graphEdgeAddFunc(sqlite3_context *pCtx, int argc,
                             sqlite3_value **argv){
   sqlite3_int64 iFromId, iToId;
   double rWeight;
   const unsigned char *zProperties;
+  int bBidirectional;
+  sqlite3_int64 iVersion;
   char *zSql;
   int rc;
 
@@ -382,8 +506,8 @@ static void graphEdgeAddFunc(sqlite3_context *pCtx, int argc,
   }
 
   /* Validate argument count */
-  if( argc!=4 ){
-    sqlite3_result_error(pCtx, "graph_edge_add() requires 4 arguments", -1);
+  if( argc!=4 && argc!=5 ){
+    sqlite3_result_error(pCtx, "graph_edge_add() requires 4 or 5 arguments", -1);
     return;
   }
   
@@ -392,8 +516,14 @@ static void graphEdgeAddFunc(sqlite3_context *pCtx, int argc,
   iToId = sqlite3_value_int64(argv[1]);
   rWeight = sqlite3_value_double(argv[2]);
   zProperties = sqlite3_value_text(argv[3]);
+  bBidirectional = argc==5 && sqlite3_value_int(argv[4])!=0;
 
-  zSql = sqlite3_mprintf("INSERT INTO %s_edges(from_id, to_id, weight, properties) VALUES(%lld, %lld, %f, %Q)", pGraph->zTableName, iFromId, iToId, rWeight, zProperties);
+  if( bBidirectional ){
+    zSql = sqlite3_mprintf("INSERT INTO %s_edges(from_id, to_id, weight, properties) VALUES(%lld, %lld, %f, %Q), (%lld, %lld, %f, %Q)", pGraph->zTableName, iFromId, iToId, rWeight, zProperties, iToId, iFromId, rWeight, zProperties);
+  }else{
+    zSql = sqlite3_mprintf("INSERT INTO %s_edges(from_id, to_id, weight, properties) VALUES(%lld, %lld, %f, %Q)", pGraph->zTableName, iFromId, iToId, rWeight, zProperties);
+  }
+  iVersion = graphDataVersion(pGraph);
   rc = sqlite3_exec(pGraph->pDb, zSql, 0, 0, 0);
   sqlite3_free(zSql);
 
@@ -402,9 +532,206 @@ static void graphEdgeAddFunc(sqlite3_context *pCtx, int argc,
     return;
   }
 
+  /* Only the two endpoints' cached adjacency is stale now */
+  graphAdjCacheInvalidateEdge(iVersion, iFromId, iToId);
+
   sqlite3_result_int64(pCtx, sqlite3_last_insert_rowid(pGraph->pDb));
 }
 
+/*
+** SQL function: graph_bulk_node_add(nodes)
+** Adds every node in a JSON array of [node_id, properties] pairs with a
+** single INSERT ... SELECT, so a batch costs one SQL function call instead
+** of one per node. Properties may be JSON objects or JSON-encoded strings.
+** Returns the number of nodes inserted.
+** Usage: SELECT graph_bulk_node_add('[[1, {"name": "Alice"}], [2, {}]]');
+*/
+static void graphBulkNodeAddFunc(sqlite3_context *pCtx, int argc,
+                                sqlite3_value **argv){
+  char *zSql;
+  sqlite3_stmt *pStmt;
+  int rc;
+
+  GraphVtab *pLocalGraph = getGlobalGraph();
+  if( pLocalGraph==0 ){
+    sqlite3_result_error(pCtx, "No graph table available. Create a graph table first using: CREATE VIRTUAL TABLE mygraph USING graph();", -1);
+    return;
+  }
+
+  /* Validate argument count */
+  if( argc!=1 ){
+    sqlite3_result_error(pCtx, "graph_bulk_node_add() requires 1 argument", -1);
+    return;
+  }
+
+  zSql = sqlite3_mprintf("INSERT INTO %s_nodes(id, properties) "
+                         "SELECT json_extract(value, '$[0]'), "
+                         "json_extract(value, '$[1]') FROM json_each(?)",
+                         pLocalGraph->zTableName);
+  if( zSql==0 ){
+    sqlite3_result_error_nomem(pCtx);
+    return;
+  }
+  rc = sqlite3_prepare_v2(pLocalGraph->pDb, zSql, -1, &pStmt, 0);
+  sqlite3_free(zSql);
+  if( rc!=SQLITE_OK ){
+    sqlite3_result_error_code(pCtx, rc);
+    return;
+  }
+
+  sqlite3_bind_value(pStmt, 1, argv[0]);
+  rc = sqlite3_step(pStmt);
+  sqlite3_finalize(pStmt);
+
+  if( rc!=SQLITE_DONE ){
+    sqlite3_result_error_code(pCtx, rc);
+    return;
+  }
+
+  sqlite3_result_int64(pCtx, sqlite3_changes(pLocalGraph->pDb));
+}
+
+/*
+** SQL function: graph_bulk_edge_add_raw(blob, n)
+** Adds n edges packed into a blob of native-endian arrays: n int64 source
+** ids, then n int64 target ids, then optionally n float64 weights (weight
+** 1.0 when omitted). One prepared INSERT is reused for every edge, so no
+** JSON or SQL text is built per edge. Properties are left NULL.
+** Returns the number of edges inserted.
+** Usage: SELECT graph_bulk_edge_add_raw(src || dst || weight, 3);
+*/
+static void graphBulkEdgeAddRawFunc(sqlite3_context *pCtx, int argc,
+                                   sqlite3_value **argv){
+  const unsigned char *aBlob;
+  sqlite3_int64 nEdge, i;
+  sqlite3_int64 iFromId, iToId;
+  double rWeight;
+  int nBlob, bWeights;
+  char *zSql;
+  sqlite3_stmt *pStmt;
+  int rc = SQLITE_OK;
+
+  GraphVtab *pLocalGraph = getGlobalGraph();
+  if( pLocalGraph==0 ){
+    sqlite3_result_error(pCtx, "No graph table available. Create a graph table first using: CREATE VIRTUAL TABLE mygraph USING graph();", -1);
+    return;
+  }
+
+  /* Validate argument count */
+  if( argc!=2 ){
+    sqlite3_result_error(pCtx, "graph_bulk_edge_add_raw() requires 2 arguments", -1);
+    return;
+  }
+
+  aBlob = (const unsigned char *)sqlite3_value_blob(argv[0]);
+  nBlob = sqlite3_value_bytes(argv[0]);
+  nEdge = sqlite3_value_int64(argv[1]);
+  if( nEdge<0 ){
+    sqlite3_result_error(pCtx, "graph_bulk_edge_add_raw(): negative edge count", -1);
+    return;
+  }
+  if( (sqlite3_int64)nBlob==nEdge*16 ){
+    bWeights = 0;
+  }else if( (sqlite3_int64)nBlob==nEdge*24 ){
+    bWeights = 1;
+  }else{
+    sqlite3_result_error(pCtx, "graph_bulk_edge_add_raw(): blob size does not match edge count", -1);
+    return;
+  }
+  if( nEdge==0 ){
+    sqlite3_result_int64(pCtx, 0);
+    return;
+  }
+
+  zSql = sqlite3_mprintf("INSERT INTO %s_edges(from_id, to_id, weight, properties) "
+                         "VALUES(?, ?, ?, NULL)", pLocalGraph->zTableName);
+  if( zSql==0 ){
+    sqlite3_result_error_nomem(pCtx);
+    return;
+  }
+  rc = sqlite3_prepare_v2(pLocalGraph->pDb, zSql, -1, &pStmt, 0);
+  sqlite3_free(zSql);
+  if( rc!=SQLITE_OK ){
+    sqlite3_result_error_code(pCtx, rc);
+    return;
+  }
+
+  rWeight = 1.0;
+  for( i=0; i<nEdge; i++ ){
+    /* memcpy because a blob carries no alignment guarantee */
+    memcpy(&iFromId, aBlob + i*8, 8);
+    memcpy(&iToId, aBlob + (nEdge + i)*8, 8);
+    if( bWeights ) memcpy(&rWeight, aBlob + (2*nEdge + i)*8, 8);
+    sqlite3_bind_int64(pStmt, 1, iFromId);
+    sqlite3_bind_int64(pStmt, 2, iToId);
+    sqlite3_bind_double(pStmt, 3, rWeight);
+    rc = sqlite3_step(pStmt);
+    sqlite3_reset(pStmt);
+    if( rc!=SQLITE_DONE ) break;
+  }
+  sqlite3_finalize(pStmt);
+
+  if( rc!=SQLITE_DONE ){
+    sqlite3_result_error_code(pCtx, rc);
+    return;
+  }
+
+  sqlite3_result_int64(pCtx, nEdge);
+}
+
+/*
+** Direct C entry point for graph_node_add().
+** Performs the same insert as the SQL function without parsing a SELECT or
+** stepping a VDBE program, for hosts that call into the library directly.
+** Returns the node id on success, -1 on error.
+*/
+sqlite3_int64 graph_node_add_direct(sqlite3_int64 iNodeId,
+                                    const char *zProperties){
+  char *zSql;
+  int rc;
+
+  GraphVtab *pLocalGraph = getGlobalGraph();
+  if( pLocalGraph==0 ){
+    return -1;
+  }
+
+  zSql = sqlite3_mprintf("INSERT INTO %s_nodes(id, properties) VALUES(%lld, %Q)", pLocalGraph->zTableName, iNodeId, zProperties);
+  if( zSql==0 ){
+    return -1;
+  }
+  rc = sqlite3_exec(pLocalGraph->pDb, zSql, 0, 0, 0);
+  sqlite3_free(zSql);
+
+  return rc==SQLITE_OK ? iNodeId : -1;
+}
+
+/*
+** Direct C entry point for graph_edge_add().
+** Returns the new edge rowid on success, -1 on error.
+*/
+sqlite3_int64 graph_edge_add_direct(sqlite3_int64 iFromId, sqlite3_int64 iToId,
+                                    double rWeight, const char *zProperties){
+  char *zSql;
+  int rc;
+
+  GraphVtab *pLocalGraph = getGlobalGraph();
+  if( pLocalGraph==0 ){
+    return -1;
+  }
+
+  zSql = sqlite3_mprintf("INSERT INTO %s_edges(from_id, to_id, weight, properties) VALUES(%lld, %lld, %f, %Q)", pLocalGraph->zTableName, iFromId, iToId, rWeight, zProperties);
+  if( zSql==0 ){
+    return -1;
+  }
+  rc = sqlite3_exec(pLocalGraph->pDb, zSql, 0, 0, 0);
+  sqlite3_free(zSql);
+
+  if( rc!=SQLITE_OK ){
+    return -1;
+  }
+  return sqlite3_last_insert_rowid(pLocalGraph->pDb);
+}
+
 /*
 ** SQL function: graph_count_nodes()
 ** Returns the number of nodes in the default graph.
@@ -484,6 +811,139 @@ static void graphCountEdgesFunc(sqlite3_context *pCtx, int argc,
   sqlite3_finalize(pStmt);
 }
 
+/*
+** SQL function: graph_build_csr()
+** Snapshots the edge table into a compressed sparse row adjacency so
+** graph_shortest_path() and graph_is_connected() can walk contiguous
+** neighbor arrays instead of running a query per visited node. Call it
+** after loading, outside a transaction; any later write or rollback
+** retires the snapshot, and one built inside a transaction is not used.
+** Returns the number of edges in the snapshot.
+** Usage: SELECT graph_build_csr();
+*/
+static void graphBuildCsrFunc(sqlite3_context *pCtx, int argc,
+                             sqlite3_value **argv){
+  CSRGraph *pNew;
+
+  if( pGraph==0 ){
+    sqlite3_result_error(pCtx, "No graph table available. Create a graph table first using: CREATE VIRTUAL TABLE mygraph USING graph();", -1);
+    return;
+  }
+
+  pNew = graphConvertToCSR(pGraph);
+  if( pNew==0 ){
+    sqlite3_result_error(pCtx, "graph_build_csr() failed to read the graph", -1);
+    return;
+  }
+
+  graphDestroyCSR(pCsr);
+  pCsr = pNew;
+  pCsrGraph = sqlite3_get_autocommit(pGraph->pDb) ? pGraph : 0;
+  iCsrVersion = graphDataVersion(pGraph);
+  sqlite3_result_int64(pCtx, pNew->nEdges);
+}
+
+/*
+** SQL function: graph_reorder_gorder([window])
+** Relabels the rows of the current CSR snapshot with the Gorder heuristic
+** so nodes that are traversed together sit next to each other in memory.
+** Node ids and query results are unaffected. window defaults to 5.
+** Returns the number of nodes reordered.
+** Usage: SELECT graph_build_csr(); SELECT graph_reorder_gorder();
+*/
+static void graphReorderGorderFunc(sqlite3_context *pCtx, int argc,
+                                  sqlite3_value **argv){
+  int nWindow = 5;
+  CSRGraph *pG;
+
+  if( argc>1 ){
+    sqlite3_result_error(pCtx, "graph_reorder_gorder() takes at most 1 argument", -1);
+    return;
+  }
+  if( argc==1 ){
+    nWindow = sqlite3_value_int(argv[0]);
+    if( nWindow<1 ){
+      sqlite3_result_error(pCtx, "Window size must be positive", -1);
+      return;
+    }
+  }
+
+  pG = graphCurrentCSR();
+  if( pG==0 ){
+    sqlite3_result_error(pCtx, "No current CSR snapshot. Call graph_build_csr() first.", -1);
+    return;
+  }
+
+  if( graphReorderCSR(pG, nWindow)!=SQLITE_OK ){
+    sqlite3_result_error_nomem(pCtx);
+    return;
+  }
+  sqlite3_result_int64(pCtx, pG->nNodes);
+}
+
+/*
+** Breadth-first shortest path over a CSR snapshot. Produces the same
+** JSON as the SQL-driven search below: node ids from the end node back
+** towards the start. Returns SQLITE_NOMEM on allocation failure.
+*/
+static int graphCsrShortestPath(sqlite3_context *pCtx, const CSRGraph *pG,
+                                sqlite3_int64 iStart, sqlite3_int64 iEnd){
+  sqlite3_int64 *aPred = sqlite3_malloc64(sizeof(sqlite3_int64) * pG->nNodes);
+  sqlite3_int64 *aQueue = sqlite3_malloc64(sizeof(sqlite3_int64) * pG->nNodes);
+  sqlite3_int64 iHead = 0, iTail = 0, i;
+  char *zPath;
+  int nPath = 0;
+
+  if( aPred==0 || aQueue==0 ){
+    sqlite3_free(aPred);
+    sqlite3_free(aQueue);
+    return SQLITE_NOMEM;
+  }
+  for(i=0; i<pG->nNodes; i++) aPred[i] = -2;  /* -2: not yet visited */
+
+  aPred[iStart] = -1;
+  aQueue[iTail++] = iStart;
+  while( iHead<iTail ){
+    sqlite3_int64 v = aQueue[iHead++];
+    sqlite3_int64 e;
+    if( v==iEnd ) break;
+
+    /* Start pulling in the next node's neighbor list while this one is scanned */
+    if( iHead<iTail ){
+      GRAPH_PREFETCH(&pG->columnIndices[pG->rowOffsets[aQueue[iHead]]]);
+    }
+    for(e=pG->rowOffsets[v]; e<pG->rowOffsets[v+1]; e++){
+      sqlite3_int64 w = pG->columnIndices[e];
+      if( aPred[w]==-2 ){
+        aPred[w] = v;
+        aQueue[iTail++] = w;
+      }
+    }
+  }
+
+  /* An unreached end node yields just [end], as the SQL search does */
+  if( aPred[iEnd]==-2 ) aPred[iEnd] = -1;
+  zPath = sqlite3_malloc64((sqlite3_uint64)22 * iTail + 24);
+  if( zPath==0 ){
+    sqlite3_free(aPred);
+    sqlite3_free(aQueue);
+    return SQLITE_NOMEM;
+  }
+  zPath[nPath++] = '[';
+  for(i=iEnd; i!=-1; i=aPred[i]){
+    if( nPath>1 ) zPath[nPath++] = ',';
+    sqlite3_snprintf(22, zPath+nPath, "%lld", pG->nodeIds[i]);
+    nPath += (int)strlen(zPath+nPath);
+  }
+  zPath[nPath++] = ']';
+  zPath[nPath] = 0;
+
+  sqlite3_result_text(pCtx, zPath, nPath, sqlite3_free);
+  sqlite3_free(aPred);
+  sqlite3_free(aQueue);
+  return SQLITE_OK;
+}
+
 /*
 ** SQL function: graph_shortest_path(start_id, end_id)
 ** Returns the shortest path between two nodes as JSON array.
@@ -512,6 +972,19 @@ static void graphShortestPathFunc(sqlite3_context *pCtx, int argc,
     return;
   }
 
+  /* Walk the CSR snapshot when one is current and knows both nodes */
+  CSRGraph *pG = graphCurrentCSR();
+  if( pG && pG->nNodes>0 ){
+    sqlite3_int64 iStartRow = graphCSRRow(pG, iStartId);
+    sqlite3_int64 iEndRow = graphCSRRow(pG, iEndId);
+    if( iStartRow>=0 && iEndRow>=0 ){
+      if( graphCsrShortestPath(pCtx, pG, iStartRow, iEndRow)!=SQLITE_OK ){
+        sqlite3_result_error_nomem(pCtx);
+      }
+      return;
+    }
+  }
+
   zSql = sqlite3_mprintf("SELECT count(*) FROM %s_nodes", pGraph->zTableName);
   rc = sqlite3_prepare_v2(pGraph->pDb, zSql, -1, &pStmt, 0);
   sqlite3_free(zSql);
@@ -551,15 +1024,15 @@ static void graphShortestPathFunc(sqlite3_context *pCtx, int argc,
   while( graphQueueDequeue(q, &currentNodeId)==SQLITE_OK ){
     if( currentNodeId==iEndId ) break;
 
-    // Explore neighbors
-    char *zSql = sqlite3_mprintf("SELECT to_id FROM %s_edges WHERE from_id = %lld", pGraph->zTableName, currentNodeId);
-    sqlite3_stmt *pStmt;
-    int rc = sqlite3_prepare_v2(pGraph->pDb, zSql, -1, &pStmt, 0);
-    sqlite3_free(zSql);
-    if( rc!=SQLITE_OK ) continue;
+    // Explore neighbors, read through the adjacency cache
+    sqlite3_int64 *aNeighbor;
+    int nNeighbor, iNeighbor;
+    if( graphAdjCacheNeighbors(currentNodeId, &aNeighbor, &nNeighbor)!=SQLITE_OK ){
+      continue;
+    }
 
-    while( sqlite3_step(pStmt)==SQLITE_ROW ){
-      sqlite3_int64 neighborId = sqlite3_column_int64(pStmt, 0);
+    for(iNeighbor=0; iNeighbor<nNeighbor; iNeighbor++){
+      sqlite3_int64 neighborId = aNeighbor[iNeighbor];
       int bVisited = 0;
       for(VisitedNode *v = visited; v; v=v->pNext){
         if( v->iNodeId == neighborId ){
@@ -581,7 +1054,7 @@ static void graphShortestPathFunc(sqlite3_context *pCtx, int argc,
         pPredecessor[neighborId] = currentNodeId;
       }
     }
-    sqlite3_finalize(pStmt);
+    sqlite3_free(aNeighbor);
   }
 
   // Reconstruct path
@@ -759,22 +1232,25 @@ iNodeId = sqlite3_value_int64(argv[0]);
     return;
   }
   
-  /* Calculate degree centrality by counting edges connected to this node */
-  zSql = sqlite3_mprintf("SELECT count(*) FROM %s_edges WHERE from_id=%lld OR to_id=%lld", 
-                         pGraph->zTableName, iNodeId, iNodeId);
-  rc = sqlite3_prepare_v2(pGraph->pDb, zSql, -1, &pStmt, 0);
-  sqlite3_free(zSql);
+  /* A current CSR snapshot answers from its packed per-node fields */
+  CSRGraph *pG = graphCurrentCSR();
+  if( pG ){
+    NodeHot hot;
+    if( graphCSRNodeHot(pG, iNodeId, &hot)!=SQLITE_OK || pG->nNodes<=1 ){
+      sqlite3_result_double(pCtx, 0.0);
+    }else{
+      sqlite3_result_double(pCtx, (double)hot.degree / (pG->nNodes - 1));
+    }
+    return;
+  }
   
+  /* Degree = edges connected to this node, read through the adjacency cache */
+  rc = graphAdjCacheDegree(iNodeId, &nDegree);
   if( rc!=SQLITE_OK ){
     sqlite3_result_error_code(pCtx, rc);
     return;
   }
   
-  if( sqlite3_step(pStmt)==SQLITE_ROW ){
-    nDegree = sqlite3_column_int(pStmt, 0);
-  }
-  sqlite3_finalize(pStmt);
-  
   /* For degree centrality, we need the total number of possible connections (n-1) */
   zSql = sqlite3_mprintf("SELECT count(*) FROM %s_nodes", pGraph->zTableName);
   rc = sqlite3_prepare_v2(pGraph->pDb, zSql, -1, &pStmt, 0);
@@ -824,7 +1300,49 @@ static void graphIsConnectedFunc(sqlite3_context *pCtx, int argc,
     return;
   }
   
-  /* Simple connectivity check: if we have nodes, check if we have edges */
+  /*
+  ** With a current CSR snapshot, answer exactly: union every edge's
+  ** endpoints and check that a single (weakly connected) component remains.
+  */
+  CSRGraph *pG = graphCurrentCSR();
+  if( pG ){
+    sqlite3_int64 *aParent;
+    sqlite3_int64 i, e, nRoots = 0;
+
+    if( pG->nNodes<=1 ){
+      sqlite3_result_int(pCtx, 1);
+      return;
+    }
+    aParent = sqlite3_malloc64(sizeof(sqlite3_int64) * pG->nNodes);
+    if( aParent==0 ){
+      sqlite3_result_error_nomem(pCtx);
+      return;
+    }
+    for(i=0; i<pG->nNodes; i++) aParent[i] = i;
+    for(i=0; i<pG->nNodes; i++){
+      for(e=pG->rowOffsets[i]; e<pG->rowOffsets[i+1]; e++){
+        sqlite3_int64 a = i, b = pG->columnIndices[e];
+        while( aParent[a]!=a ) a = aParent[a] = aParent[aParent[a]];
+        while( aParent[b]!=b ) b = aParent[b] = aParent[aParent[b]];
+        if( a!=b ) aParent[a] = b;
+      }
+    }
+    for(i=0; i<pG->nNodes; i++){
+      if( aParent[i]==i ) nRoots++;
+    }
+    sqlite3_free(aParent);
+    sqlite3_result_int(pCtx, nRoots==1);
+    return;
+  }
+  
+  /*
+  ** Otherwise do the same over the tables: read the node ids in order, then
+  ** union the endpoints of each edge, found by bisection. Edges to nodes
+  ** that are not in the nodes table are ignored, as in the snapshot.
+  */
+  sqlite3_int64 nNodes = 0, nRows = 0, nComponents;
+  sqlite3_int64 *aId, *aParent;
+
   zSql = sqlite3_mprintf("SELECT count(*) FROM %s_nodes", pGraph->zTableName);
   rc = sqlite3_prepare_v2(pGraph->pDb, zSql, -1, &pStmt, 0);
   sqlite3_free(zSql);
@@ -834,9 +1352,8 @@ static void graphIsConnectedFunc(sqlite3_context *pCtx, int argc,
     return;
   }
   
-  int nNodes = 0;
   if( sqlite3_step(pStmt)==SQLITE_ROW ){
-    nNodes = sqlite3_column_int(pStmt, 0);
+    nNodes = sqlite3_column_int64(pStmt, 0);
   }
   sqlite3_finalize(pStmt);
   
@@ -846,24 +1363,64 @@ static void graphIsConnectedFunc(sqlite3_context *pCtx, int argc,
     return;
   }
   
-  /* For a connected graph, we need at least n-1 edges */
-  zSql = sqlite3_mprintf("SELECT count(*) FROM %s_edges", pGraph->zTableName);
+  aId = sqlite3_malloc64(sizeof(sqlite3_int64) * nNodes * 2);
+  if( aId==0 ){
+    sqlite3_result_error_nomem(pCtx);
+    return;
+  }
+  aParent = &aId[nNodes];
+  
+  zSql = sqlite3_mprintf("SELECT id FROM %s_nodes ORDER BY id", pGraph->zTableName);
   rc = sqlite3_prepare_v2(pGraph->pDb, zSql, -1, &pStmt, 0);
   sqlite3_free(zSql);
+  if( rc==SQLITE_OK ){
+    while( nRows<nNodes && sqlite3_step(pStmt)==SQLITE_ROW ){
+      aParent[nRows] = nRows;
+      aId[nRows++] = sqlite3_column_int64(pStmt, 0);
+    }
+    rc = sqlite3_finalize(pStmt);
+  }
+  nComponents = nRows;
+  
+  if( rc==SQLITE_OK ){
+    zSql = sqlite3_mprintf("SELECT from_id, to_id FROM %s_edges", pGraph->zTableName);
+    rc = sqlite3_prepare_v2(pGraph->pDb, zSql, -1, &pStmt, 0);
+    sqlite3_free(zSql);
+  }
+  if( rc==SQLITE_OK ){
+    while( nComponents>1 && sqlite3_step(pStmt)==SQLITE_ROW ){
+      sqlite3_int64 aEnd[2];
+      int k;
+      for(k=0; k<2; k++){
+        sqlite3_int64 iId = sqlite3_column_int64(pStmt, k);
+        sqlite3_int64 lo = 0, hi = nRows;
+        while( lo<hi ){
+          sqlite3_int64 mid = lo + (hi - lo)/2;
+          if( aId[mid]<iId ) lo = mid + 1; else hi = mid;
+        }
+        aEnd[k] = (lo<nRows && aId[lo]==iId) ? lo : -1;
+      }
+      if( aEnd[0]<0 || aEnd[1]<0 ) continue;
+      while( aParent[aEnd[0]]!=aEnd[0] ){
+        aEnd[0] = aParent[aEnd[0]] = aParent[aParent[aEnd[0]]];
+      }
+      while( aParent[aEnd[1]]!=aEnd[1] ){
+        aEnd[1] = aParent[aEnd[1]] = aParent[aParent[aEnd[1]]];
+      }
+      if( aEnd[0]!=aEnd[1] ){
+        aParent[aEnd[0]] = aEnd[1];
+        nComponents--;
+      }
+    }
+    rc = sqlite3_finalize(pStmt);
+  }
+  sqlite3_free(aId);
   
   if( rc!=SQLITE_OK ){
     sqlite3_result_error_code(pCtx, rc);
     return;
   }
-  
-  int nEdges = 0;
-  if( sqlite3_step(pStmt)==SQLITE_ROW ){
-    nEdges = sqlite3_column_int(pStmt, 0);
-  }
-  sqlite3_finalize(pStmt);
-  
-  /* Basic connectivity check: at least n-1 edges required */
-  bConnected = (nEdges >= nNodes - 1) ? 1 : 0;
+  bConnected = nComponents<=1;
   sqlite3_result_int(pCtx, bConnected);
 }
 